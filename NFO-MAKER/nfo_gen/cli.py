@@ -3,17 +3,31 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import os
 import re
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-from .extract_tech import extract_tech
-from .imdb_client import ImdbClient, ImdbError
-from .nfo_template import render_nfo, render_nfo_from_sections, render_nfo_sections
+from .nfo_template import render_nfo, render_nfo_from_sections, render_nfo_section, render_nfo_sections
 from .parser_filename import parse_filename
-from .tmdb_client import TmdbClient, TmdbError
-from .utils import compute_hash, format_duration, format_size, normalize_language, quality_from_resolution
+from .utils import (
+    format_duration,
+    format_size,
+    hash_constructor,
+    hash_fileobj,
+    normalize_language,
+    quality_from_resolution,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    # Clients HTTP importes a la demande (urllib/ssl inutiles avec --no-tmdb).
+    from .imdb_client import ImdbClient
+    from .tmdb_client import TmdbClient
 
 
 SOURCE_TOKENS = {
@@ -28,14 +42,44 @@ SOURCE_TOKENS = {
     "brrip": "BRRIP",
 }
 
+# Un seul scan pour la source: le premier token alphanumerique connu gagne.
+# Les cles avec separateur (web-dl) sont exclues: le nom est lu token par token, elles ne
+# peuvent donc pas correspondre (sinon "web-dl ... remux" changerait de source).
+_SOURCE_RE = re.compile(
+    r"(?<![a-z0-9])("
+    + "|".join(re.escape(token) for token in SOURCE_TOKENS if token.isalnum())
+    + r")(?![a-z0-9])",
+    re.IGNORECASE,
+)
+
+
+def _slug_table(sep: str) -> bytes:
+    """Table bytes.translate: octet alphanumerique conserve, tout le reste -> separateur."""
+    fill = ord(sep)
+    return bytes(code if code < 128 and chr(code).isalnum() else fill for code in range(256))
+
+
+# Apres encode("ascii", "replace"), chaque caractere non ASCII devient "?" -> separateur.
+_DASH_SLUG_TABLE = _slug_table("-")
+_DOT_SLUG_TABLE = _slug_table(".")
+_DASH_RUN_RE = re.compile(r"-{2,}")
+_DOT_RUN_RE = re.compile(r"\.{2,}")
+
+# Extensions retenues quand un dossier est passe sans --glob.
+VIDEO_EXTENSIONS = frozenset({".avi", ".m2ts", ".m4v", ".mkv", ".mov", ".mp4", ".ts", ".webm", ".wmv"})
+
+# Hashes deja calcules: (chemin, algo, mtime_ns, taille) -> hash.
+_HASH_CACHE: Dict[Tuple[str, str, int, int], str] = {}
 
+
+@functools.lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
-    """Construit l'argparse avec les options supportees."""
+    """Construit l'argparse avec les options supportees (une seule fois par process)."""
     parser = argparse.ArgumentParser(
         prog="nfo_gen",
         description="Generate a release-style NFO from a video file.",
     )
-    parser.add_argument("video", nargs="?", help="Path to the video file")
+    parser.add_argument("video", nargs="?", help="Path to the video file (or a directory for batch mode)")
     parser.add_argument("--tmdb-id", type=int, help="TMDB movie id")
     parser.add_argument("--title", help="Override movie title")
     parser.add_argument("--year", type=int, help="Override movie year")
@@ -46,12 +90,20 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--interactive", action="store_true", help="Interactive guided CLI")
     parser.add_argument("--config", help="Path to config.json (tmdb_token/tmdb_api_key)")
     parser.add_argument("--print", dest="print_out", action="store_true", help="Print NFO to console")
+    parser.add_argument(
+        "--glob",
+        help="Batch mode: glob pattern relative to the video directory (default: known video extensions)",
+    )
     parser.add_argument(
         "--hash",
         dest="hash_algo",
-        choices=["sha1", "sha256"],
-        default="sha1",
-        help="Hash algorithm for file hash (default: sha1)",
+        choices=["sha1", "sha256", "blake3", "xxh3", "xxh64"],
+        default="sha256",
+        help=(
+            "Hash algorithm for file hash (default: sha256; xxh3 recommended for fast "
+            "non-cryptographic fixity; blake3/xxh3/xxh64 need the blake3/xxhash packages; "
+            "sha256/blake3 digests get their own line in the NFO)"
+        ),
     )
     return parser
 
@@ -81,10 +133,11 @@ def prompt_nonempty(prompt: str) -> str:
 
 def prompt_multiline(prompt: str) -> List[str]:
     """Demande plusieurs lignes jusqu'a une ligne vide."""
-    print(prompt)
+    print(prompt, flush=True)
     lines: List[str] = []
-    while True:
-        value = input().rstrip()
+    # Lecture directe de stdin: evite le cout d'input() (readline/historique) par ligne.
+    for raw in iter(sys.stdin.readline, ""):
+        value = raw.rstrip()
         if not value:
             break
         lines.append(value)
@@ -115,9 +168,9 @@ def format_section(name: str, lines: List[str], numbered: bool = False) -> None:
             print(line)
 
 
-def na_indices(lines: List[str]) -> List[int]:
-    """Liste des lignes contenant un N/A."""
-    return [idx for idx, line in enumerate(lines) if "N/A" in line]
+def has_na(lines: List[str]) -> bool:
+    """Indique si une ligne contient un N/A (s'arrete a la premiere trouvee)."""
+    return any("N/A" in line for line in lines)
 
 
 def replace_line(lines: List[str], idx: int, new_value: str) -> List[str]:
@@ -132,41 +185,34 @@ def replace_line(lines: List[str], idx: int, new_value: str) -> List[str]:
     return lines
 
 
+@functools.lru_cache(maxsize=32)
+def _header_pattern(field: str) -> re.Pattern[str]:
+    """Compile (une seule fois) le motif d'un champ du header."""
+    return re.compile(rf"({re.escape(field)}:\s*)([^|]+)")
+
+
 def replace_header_field(line: str, field: str, value: str) -> str:
     """Remplace une valeur dans la ligne de header (Source/Resolution/etc.)."""
     safe_value = value if value.strip() else "N/A"
-    pattern = rf"({re.escape(field)}:\s*)([^|]+)"
-    if re.search(pattern, line):
-        return re.sub(pattern, rf"\1{safe_value} ", line)
-    return line
+    # subn fait la recherche et le remplacement en un seul passage.
+    new_line, _ = _header_pattern(field).subn(lambda m: f"{m.group(1)}{safe_value} ", line, count=1)
+    return new_line
+
+
+def _slugify(value: str, sep: str, table: bytes, run_re: re.Pattern[str]) -> str:
+    """Traduit en bytes puis fusionne les separateurs consecutifs en une seule passe."""
+    slug = value.strip().encode("ascii", "replace").translate(table).decode("ascii")
+    return run_re.sub(sep, slug).strip(sep)
 
 
 def slugify_ascii(value: str) -> str:
     """Normalise un texte pour un nom de fichier conventionnel."""
-    cleaned = []
-    for char in value.strip():
-        if char.isalnum() and ord(char) < 128:
-            cleaned.append(char)
-        else:
-            cleaned.append("-")
-    slug = "".join(cleaned)
-    while "--" in slug:
-        slug = slug.replace("--", "-")
-    return slug.strip("-")
+    return _slugify(value, "-", _DASH_SLUG_TABLE, _DASH_RUN_RE)
 
 
 def slugify_release_title(value: str) -> str:
     """Normalise un titre pour un nom de release avec des points."""
-    cleaned = []
-    for char in value.strip():
-        if char.isalnum() and ord(char) < 128:
-            cleaned.append(char)
-        else:
-            cleaned.append(".")
-    slug = "".join(cleaned)
-    while ".." in slug:
-        slug = slug.replace("..", ".")
-    return slug.strip(".")
+    return _slugify(value, ".", _DOT_SLUG_TABLE, _DOT_RUN_RE)
 
 
 def audio_tag(audios: List[Dict[str, object]]) -> str:
@@ -184,11 +230,13 @@ def audio_tag(audios: List[Dict[str, object]]) -> str:
 
 def language_tag(audios: List[Dict[str, object]]) -> str:
     """Construit un tag langue court (ex: MULTi/FR/EN)."""
-    langs: List[str] = []
+    # dict = ensemble ordonne: dedoublonnage O(1) en gardant l'ordre des pistes.
+    seen: Dict[str, None] = {}
     for audio in audios:
         lang = normalize_language(audio.get("language"))
-        if lang and lang not in langs:
-            langs.append(lang)
+        if lang:
+            seen.setdefault(lang, None)
+    langs = list(seen)
     if not langs:
         return "LANG"
     if len(langs) > 1:
@@ -218,20 +266,22 @@ def build_conventional_name(
     source: Optional[str],
 ) -> str:
     """Propose un nom de fichier conventionnel."""
-    general = tech.get("general", {}) if isinstance(tech, dict) else {}
-    videos = tech.get("videos", []) if isinstance(tech, dict) else []
-    audios = tech.get("audios", []) if isinstance(tech, dict) else []
+    if not isinstance(tech, dict):
+        tech = {}
+    general = tech.get("general") or {}
+    videos = tech.get("videos") or []
+    audios = tech.get("audios") or []
     base_title = title or general.get("filename") or video_path.stem
     title_slug = slugify_release_title(str(base_title))
     year_tag = str(year) if year else "YEAR"
-    lang = language_tag(audios) if isinstance(audios, list) else "LANG"
+    lang = language_tag(audios)
     source = (source or "SOURCE").upper()
     resolution = "RESOLUTION"
     if videos:
         height = videos[0].get("height")
         width = videos[0].get("width")
         resolution = quality_from_resolution(height, width)
-    video = video_tag(videos) if isinstance(videos, list) else "VIDEO"
+    video = video_tag(videos)
     group = "TSC"
     ext = video_path.suffix
     return f"{title_slug}.{year_tag}.{lang}.{resolution}.{source}.{video}-{group}{ext}"
@@ -243,8 +293,11 @@ def prompt_rename(
     year: Optional[int],
     tech: Dict[str, object],
     source: Optional[str],
+    stat_cache: Optional[Dict[Path, os.stat_result]] = None,
 ) -> Path:
     """Propose un renommage de fichier et applique si confirme."""
+    if stat_cache is None:
+        stat_cache = {}
     proposed = build_conventional_name(video_path, title, year, tech, source)
     print(f"Nom propose: {proposed}")
     if not prompt_yes_no("Renommer le fichier avec ce nom ?", default=True):
@@ -255,83 +308,179 @@ def prompt_rename(
     target = Path(proposed)
     if not target.is_absolute():
         target = video_path.parent / target
-    if target.exists() and target != video_path:
-        if not prompt_yes_no(f"{target} existe. Ecraser ?", default=False):
-            return video_path
     if target == video_path:
         return video_path
+    if cached_stat(target, stat_cache) is not None:
+        if not prompt_yes_no(f"{target} existe. Ecraser ?", default=False):
+            return video_path
     video_path.rename(target)
+    # Le renommage invalide les deux entrees du cache.
+    stat_cache.pop(video_path, None)
+    stat_cache.pop(target, None)
     return target
 
 
 def detect_source_from_name(filename: str) -> Optional[str]:
     """Detecte une source probable depuis le nom de fichier."""
-    tokens = re.split(r"[^a-z0-9]+", filename.lower())
-    for token in tokens:
-        if token in SOURCE_TOKENS:
-            return SOURCE_TOKENS[token]
-    return None
+    match = _SOURCE_RE.search(filename)
+    return SOURCE_TOKENS[match.group(1).lower()] if match else None
 
 
-def build_file_info(video_path: Path, tech: Dict[str, object], hash_algo: str) -> Dict[str, object]:
-    """Construit les informations de fichier pour le NFO."""
-    general = tech.get("general", {})
-    size_bytes = general.get("size_bytes") or video_path.stat().st_size
-    duration_sec = general.get("duration_sec")
-    file_hash = compute_hash(video_path, hash_algo)
+def stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """Retourne le stat du chemin, ou None s'il est inaccessible."""
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def cached_stat(path: Path, cache: Dict[Path, os.stat_result]) -> Optional[os.stat_result]:
+    """stat_or_none memoise par chemin (a invalider apres renommage)."""
+    stat = cache.get(path)
+    if stat is None:
+        stat = stat_or_none(path)
+        if stat is not None:
+            cache[path] = stat
+    return stat
+
+
+def build_file_info_nohash(
+    video_path: Path, tech: Dict[str, object], stat: Optional[os.stat_result] = None
+) -> Dict[str, object]:
+    """Construit les informations de fichier sans calculer le hash."""
+    general = tech.get("general") or {}
+    size_bytes = general.get("size_bytes")
+    if not size_bytes:
+        # stat seulement si MediaInfo/ffprobe n'a pas donne la taille.
+        size_bytes = (stat or video_path.stat()).st_size
     return {
         "path": str(video_path),
         "size_bytes": size_bytes,
-        "duration_sec": duration_sec,
-        "hash": f"{hash_algo.upper()} {file_hash}",
+        "duration_sec": general.get("duration_sec"),
     }
 
 
+def ensure_hash(
+    video_path: Path,
+    hash_algo: str,
+    cache: Optional[Dict[Tuple[str, str, int, int], str]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> str:
+    """Retourne le hash du fichier, recalcule seulement si le fichier a change."""
+    if cache is None:
+        cache = _HASH_CACHE
+    # Une seule ouverture: fstat pour la cle de cache, puis hash sur le meme descripteur.
+    with open(video_path, "rb", buffering=0) as handle:
+        stat = os.fstat(handle.fileno())
+        key = (str(video_path), hash_algo, stat.st_mtime_ns, stat.st_size)
+        file_hash = cache.get(key)
+        if file_hash is None:
+            file_hash = hash_fileobj(handle, hash_algo, size=stat.st_size, cancel=cancel)
+            cache[key] = file_hash
+    return file_hash
+
+
+def run_in_background(func: Callable[..., Any], *args: Any) -> Future:
+    """Lance une fonction dans un thread daemon et retourne son Future."""
+    from concurrent.futures import Future
+
+    future: Future = Future()
+
+    def worker() -> None:
+        try:
+            future.set_result(func(*args))
+        except BaseException as exc:  # Propage l'erreur au consommateur.
+            future.set_exception(exc)
+
+    # Daemon: une sortie anticipee (erreur, Ctrl+C) n'attend pas la fin du hash.
+    threading.Thread(target=worker, daemon=True).start()
+    return future
+
+
+def build_file_info(
+    video_path: Path,
+    tech: Dict[str, object],
+    hash_algo: str,
+    stat: Optional[os.stat_result] = None,
+) -> Dict[str, object]:
+    """Construit les informations de fichier pour le NFO."""
+    file_info = build_file_info_nohash(video_path, tech, stat=stat)
+    # Evite de rehasher un fichier inchange (refresh interactif, renommage).
+    file_hash = ensure_hash(video_path, hash_algo)
+    file_info["hash"] = f"{hash_algo.upper()} {file_hash}"
+    return file_info
+
+
+def open_output(output_path: Path, overwrite: bool) -> int:
+    """Ouvre le NFO en ecriture; sans overwrite, O_EXCL verifie et cree en un seul appel."""
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_TRUNC if overwrite else os.O_EXCL
+    return os.open(output_path, flags, 0o644)
+
+
 def enrich_movie(client: TmdbClient, movie: Optional[Dict[str, object]]) -> None:
     """Ajoute les liens TMDB/IMDb au film si possible."""
+    from .tmdb_client import TmdbError
+
     if not movie or not movie.get("id"):
         return
     movie["tmdb_url"] = f"https://www.themoviedb.org/movie/{movie['id']}"
-    try:
-        external = client.get_external_ids(movie["id"])
-    except TmdbError:
-        return
+    external = movie.get("external_ids")
+    if not isinstance(external, dict):
+        # Entree de cache anterieure a append_to_response: requete dediee.
+        try:
+            external = client.get_external_ids(movie["id"])
+        except TmdbError:
+            return
     imdb_id = external.get("imdb_id") if isinstance(external, dict) else None
     if imdb_id:
         movie["imdb_url"] = f"https://www.imdb.com/title/{imdb_id}"
 
 
-def main(argv: Optional[list[str]] = None) -> int:
-    """Point d'entree principal: genere le NFO pour un fichier video."""
-    parser = build_parser()
-    args = parser.parse_args(argv)
-
-    if not args.video and not args.interactive:
-        parser.error("video is required unless --interactive is used")
+def _process_one(
+    args: argparse.Namespace,
+    video_path: Path,
+    video_stat: os.stat_result,
+    stat_cache: Dict[Path, os.stat_result],
+    client: Optional[TmdbClient] = None,
+    imdb_client: Optional[ImdbClient] = None,
+    resolved: Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]] = None,
+) -> int:
+    """Genere le NFO d'un fichier video (clients TMDB/OMDb partages par l'appelant).
+
+    resolved: resultat TMDB deja obtenu (mode batch), evite le premier resolve_movie.
+    """
+    # Import differe: subprocess/shutil inutiles pour --help ou une erreur d'argument.
+    from .extract_tech import extract_tech
 
-    if args.video:
-        video_path = Path(args.video)
-    else:
-        video_path = None
+    output_path = Path(args.output) if args.output else video_path.with_suffix(".nfo")
+    if not (args.interactive or args.overwrite) and output_path.exists():
+        # Refus certain: inutile de lancer la lecture complete du fichier pour rien.
+        print(f"Output exists: {output_path} (use --overwrite)", file=sys.stderr)
+        return 1
 
-    if args.interactive:
-        while not video_path or not video_path.exists():
-            if video_path and not video_path.exists():
-                print("Fichier introuvable, reessayez.")
-            candidate = Path(prompt_nonempty("Chemin du fichier video: ").strip('"'))
-            if candidate.exists():
-                video_path = candidate
+    # Hash et extraction technique (MediaInfo/ffprobe) en parallele de TMDB.
+    cancel_hash = threading.Event()
+    hash_future = run_in_background(ensure_hash, video_path, args.hash_algo, None, cancel_hash)
+    tech_future = run_in_background(extract_tech, video_path)
 
-    if not video_path or not video_path.exists():
-        print(f"File not found: {video_path}", file=sys.stderr)
+    def abort() -> int:
+        # Echec: le hash abandonne ne doit pas concurrencer la lecture de la video suivante.
+        cancel_hash.set()
         return 1
 
-    # Extraction technique via MediaInfo/ffprobe.
-    try:
-        tech = extract_tech(video_path)
-    except RuntimeError as exc:
-        print(str(exc), file=sys.stderr)
-        return 1
+    def wait_tech() -> Optional[Dict[str, Any]]:
+        try:
+            return tech_future.result()
+        except RuntimeError as exc:
+            print(str(exc), file=sys.stderr)
+            return None
+
+    if args.interactive:
+        # Pas de questions TMDB si l'extraction echoue de toute facon.
+        tech = wait_tech()
+        if tech is None:
+            return abort()
 
     # Parsing du nom de fichier pour titre/annee.
     parsed = parse_filename(video_path.name)
@@ -341,22 +490,22 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     movie: Optional[Dict[str, object]] = None
     match_note: Optional[str] = None
-    client: Optional[TmdbClient] = None
-    imdb_client: Optional[ImdbClient] = None
-    if not args.no_tmdb:
-        # Client TMDB (env ou config).
-        config_path = Path(args.config) if args.config else None
-        client = TmdbClient.from_env(config_path=config_path)
-        imdb_client = ImdbClient.from_env(config_path=config_path)
+    if client:
+        from .imdb_client import ImdbError
+        from .tmdb_client import TmdbError
+
         try:
-            # Resout le film (id direct ou recherche).
-            movie, match_note = client.resolve_movie(
-                tmdb_id=args.tmdb_id,
-                title=title,
-                year=year,
-                lang=args.lang,
-                interactive=args.interactive,
-            )
+            # Resout le film (id direct ou recherche), sauf si deja fait par le batch.
+            if resolved is not None:
+                movie, match_note = resolved
+            else:
+                movie, match_note = client.resolve_movie(
+                    tmdb_id=args.tmdb_id,
+                    title=title,
+                    year=year,
+                    lang=args.lang,
+                    interactive=args.interactive,
+                )
             if movie and not year:
                 release = str(movie.get("release_date") or "")
                 if release[:4].isdigit():
@@ -397,13 +546,19 @@ def main(argv: Optional[list[str]] = None) -> int:
                             lang=args.lang,
                             interactive=args.interactive,
                         )
-            if client:
-                enrich_movie(client, movie)
+            enrich_movie(client, movie)
         except TmdbError as exc:
             print(f"TMDB error: {exc}", file=sys.stderr)
-            return 1
+            return abort()
 
-    file_info = build_file_info(video_path, tech, args.hash_algo)
+    if not args.interactive:
+        tech = wait_tech()
+        if tech is None:
+            return abort()
+
+    # Le hash est deja en cache une fois le thread termine.
+    hash_future.result()
+    file_info = build_file_info(video_path, tech, args.hash_algo, stat=video_stat)
 
     if args.interactive:
         sections = render_nfo_sections(
@@ -417,6 +572,24 @@ def main(argv: Optional[list[str]] = None) -> int:
         )
         manual_sections: set[str] = set()
 
+        def render_section(section_name: str) -> List[str]:
+            # Ne reconstruit que la section demandee.
+            return render_nfo_section(
+                section_name,
+                movie=movie,
+                tech=tech,
+                file_info=file_info,
+                match_note=match_note,
+                title_override=title,
+                year_override=year,
+                source_override=source,
+            )
+
+        def fresh_stat() -> Optional[os.stat_result]:
+            # Une nouvelle detection doit voir le fichier tel qu'il est sur disque.
+            stat_cache.pop(video_path, None)
+            return cached_stat(video_path, stat_cache)
+
         def refresh_section(name: str, manual: set[str]) -> Dict[str, List[str]]:
             nonlocal movie, match_note, tech, file_info
             updates: Dict[str, List[str]] = {}
@@ -435,60 +608,35 @@ def main(argv: Optional[list[str]] = None) -> int:
                     interactive=True,
                 )
                 enrich_movie(client, movie)
-                new_sections = render_nfo_sections(
-                    movie=movie,
-                    tech=tech,
-                    file_info=file_info,
-                    match_note=match_note,
-                    title_override=title,
-                    year_override=year,
-                    source_override=source,
-                )
-                section_map = {sec: sec_lines for sec, sec_lines in new_sections}
-                updates["Movie"] = section_map.get("Movie", [])
+                updates["Movie"] = render_section("Movie")
                 if "Header" not in manual:
-                    updates["Header"] = section_map.get("Header", [])
+                    updates["Header"] = render_section("Header")
             elif name in {"General", "Video", "Audio", "Subtitles"}:
                 try:
                     tech = extract_tech(video_path)
                 except RuntimeError as exc:
                     print(str(exc))
                     return updates
-                file_info = build_file_info(video_path, tech, args.hash_algo)
-                new_sections = render_nfo_sections(
-                    movie=movie,
-                    tech=tech,
-                    file_info=file_info,
-                    match_note=match_note,
-                    title_override=title,
-                    year_override=year,
-                    source_override=source,
-                )
-                section_map = {sec: sec_lines for sec, sec_lines in new_sections}
-                updates[name] = section_map.get(name, [])
+                file_info = build_file_info(video_path, tech, args.hash_algo, stat=fresh_stat())
+                updates[name] = render_section(name)
                 if "Header" not in manual:
-                    updates["Header"] = section_map.get("Header", [])
+                    updates["Header"] = render_section("Header")
             elif name == "File":
-                file_info = build_file_info(video_path, tech, args.hash_algo)
-                new_sections = render_nfo_sections(
-                    movie=movie,
-                    tech=tech,
-                    file_info=file_info,
-                    match_note=match_note,
-                    title_override=title,
-                    year_override=year,
-                    source_override=source,
-                )
-                section_map = {sec: sec_lines for sec, sec_lines in new_sections}
-                updates["File"] = section_map.get("File", [])
+                file_info = build_file_info(video_path, tech, args.hash_algo, stat=fresh_stat())
+                updates["File"] = render_section("File")
             return updates
 
         idx = 0
         while idx < len(sections):
             name, lines = sections[idx]
+            # Le scan N/A n'est refait qu'apres une modification de la section.
+            na_dirty = True
+            missing = False
             while True:
                 format_section(name, lines, numbered=False)
-                missing = na_indices(lines)
+                if na_dirty:
+                    missing = has_na(lines)
+                    na_dirty = False
                 if missing:
                     if name == "Header":
                         header_line = lines[0] if lines else ""
@@ -503,6 +651,7 @@ def main(argv: Optional[list[str]] = None) -> int:
                                 source = new_value or source
                                 manual_sections.add(name)
                                 sections[idx] = (name, lines)
+                                na_dirty = True
                                 continue
                         else:
                             print("Valeurs N/A detectees.")
@@ -531,6 +680,7 @@ def main(argv: Optional[list[str]] = None) -> int:
                         did_change = True
                     sections[idx] = (name, lines)
                     if did_change:
+                        na_dirty = True
                         continue
                 if prompt_yes_no(f"Section {name} correcte ?", default=True):
                     break
@@ -545,7 +695,8 @@ def main(argv: Optional[list[str]] = None) -> int:
                             (sec, updates.get(sec, sec_lines))
                             for sec, sec_lines in sections
                         ]
-                        lines = dict(sections).get(name, lines)
+                        lines = updates.get(name, lines)
+                        na_dirty = True
                         if name in manual_sections:
                             manual_sections.remove(name)
                     else:
@@ -578,6 +729,7 @@ def main(argv: Optional[list[str]] = None) -> int:
                         lines = replace_line(lines, line_idx - 1, new_value)
                         manual_sections.add(name)
                     sections[idx] = (name, lines)
+                    na_dirty = True
                 format_section(name, lines, numbered=False)
                 if prompt_yes_no(f"Section {name} correcte maintenant ?", default=True):
                     break
@@ -587,15 +739,18 @@ def main(argv: Optional[list[str]] = None) -> int:
             if not source:
                 source = input("Source (BDRIP/WEBRIP/etc., laisser vide pour SOURCE): ").strip() or None
             rename_title = title
-            if movie and movie.get("title"):
-                rename_title = str(movie.get("title"))
+            if movie and (movie_title := movie.get("title")):
+                rename_title = str(movie_title)
             rename_year = year
             if movie and not rename_year:
                 release = str(movie.get("release_date") or "")
                 if release[:4].isdigit():
                     rename_year = int(release[:4])
-            video_path = prompt_rename(video_path, rename_title, rename_year, tech, source)
-            file_info = build_file_info(video_path, tech, args.hash_algo)
+            video_path = prompt_rename(
+                video_path, rename_title, rename_year, tech, source, stat_cache=stat_cache
+            )
+            # Un renommage ne change pas le contenu: on garde taille/duree/hash.
+            file_info["path"] = str(video_path)
         if prompt_yes_no("Ajouter une section Notes ?", default=False):
             note_lines = prompt_multiline("Entrez les notes (ligne vide pour terminer):")
             if note_lines:
@@ -618,16 +773,20 @@ def main(argv: Optional[list[str]] = None) -> int:
             source_override=source,
         )
 
+    # Recalcule: le renommage interactif a pu changer video_path.
     output_path = Path(args.output) if args.output else video_path.with_suffix(".nfo")
-    if output_path.exists() and not args.overwrite:
+    try:
+        fd = open_output(output_path, overwrite=args.overwrite)
+    except FileExistsError:
         if args.interactive and prompt_yes_no(f"{output_path} existe. Ecraser ?", default=False):
-            pass
+            fd = open_output(output_path, overwrite=True)
         else:
             print(f"Output exists: {output_path} (use --overwrite)", file=sys.stderr)
             return 1
 
     # Ecriture du fichier NFO.
-    output_path.write_text(nfo_text, encoding="utf-8")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(nfo_text)
     if args.print_out:
         print(nfo_text)
 
@@ -639,5 +798,156 @@ def main(argv: Optional[list[str]] = None) -> int:
     return 0
 
 
+def _build_clients(args: argparse.Namespace) -> Tuple[Optional[TmdbClient], Optional[ImdbClient]]:
+    """Construit les clients TMDB/OMDb (env ou config), une fois par execution."""
+    if args.no_tmdb:
+        return None, None
+    from .imdb_client import ImdbClient
+    from .tmdb_client import TmdbClient
+
+    config_path = Path(args.config) if args.config else None
+    return TmdbClient.from_env(config_path=config_path), ImdbClient.from_env(config_path=config_path)
+
+
+def _check_hash_algo(hash_algo: str) -> bool:
+    """Verifie tout de suite que l'algo de hash est disponible."""
+    try:
+        hash_constructor(hash_algo)
+    except RuntimeError as exc:
+        print(str(exc), file=sys.stderr)
+        return False
+    return True
+
+
+def collect_videos(root: Path, pattern: Optional[str] = None) -> List[Path]:
+    """Liste les videos d'un dossier (ou celles correspondant au motif glob).
+
+    Leve ValueError si le motif n'est pas un glob relatif au dossier.
+    """
+    if not pattern:
+        candidates = (path for path in root.iterdir() if path.suffix.lower() in VIDEO_EXTENSIONS)
+        return sorted(path for path in candidates if path.is_file())
+    if Path(pattern).is_absolute():
+        raise ValueError(f"--glob must be relative to the directory: {pattern}")
+    try:
+        return sorted(path for path in root.glob(pattern) if path.is_file())
+    except (NotImplementedError, ValueError) as exc:
+        # Path.glob rejette certains motifs (vide, "**" mal place...) pendant l'iteration.
+        raise ValueError(f"Invalid --glob pattern {pattern!r}: {exc}") from exc
+
+
+def _prefetch_movies(
+    args: argparse.Namespace, videos: List[Path], client: Optional[TmdbClient]
+) -> List[Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]]]:
+    """Resout TMDB pour toutes les videos en parallele (None: resolution au fil de l'eau)."""
+    if not client or args.interactive:
+        return [None] * len(videos)
+    from .tmdb_client import TmdbError
+
+    items = []
+    for video_path in videos:
+        parsed = parse_filename(video_path.name)
+        items.append((None, parsed.title, parsed.year, args.lang))
+    try:
+        return list(client.resolve_many(items))
+    except TmdbError:
+        # Une erreur sera signalee fichier par fichier lors de la resolution sequentielle.
+        return [None] * len(videos)
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    """Genere un NFO par video trouvee, avec des clients TMDB/OMDb partages."""
+    # Options propres a un seul film: les appliquer a tout le dossier serait faux.
+    for option, value in (
+        ("--output", args.output),
+        ("--tmdb-id", args.tmdb_id),
+        ("--title", args.title),
+        ("--year", args.year),
+    ):
+        if value:
+            print(f"{option} cannot be used with a directory or --glob", file=sys.stderr)
+            return 2
+    root = Path(args.video) if args.video else Path.cwd()
+    try:
+        videos = collect_videos(root, args.glob)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    if not videos:
+        print(f"No video found in: {root}", file=sys.stderr)
+        return 1
+    if not _check_hash_algo(args.hash_algo):
+        return 1
+
+    client, imdb_client = _build_clients(args)
+    failures = 0
+    try:
+        resolved = _prefetch_movies(args, videos, client)
+        for video_path, movie_result in zip(videos, resolved):
+            stat_cache: Dict[Path, os.stat_result] = {}
+            video_stat = cached_stat(video_path, stat_cache)
+            if video_stat is None:
+                print(f"File not found: {video_path}", file=sys.stderr)
+                failures += 1
+                continue
+            if _process_one(
+                args, video_path, video_stat, stat_cache, client, imdb_client, movie_result
+            ) != 0:
+                failures += 1
+    finally:
+        if client:
+            client.close()
+        if imdb_client:
+            imdb_client.close()
+    if failures:
+        print(f"{failures}/{len(videos)} NFO(s) failed.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Point d'entree principal: genere le NFO pour un fichier video."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.glob or (args.video and Path(args.video).is_dir()):
+        return _run_batch(args)
+
+    if not args.video and not args.interactive:
+        parser.error("video is required unless --interactive is used")
+
+    video_path = Path(args.video) if args.video else None
+    # Un seul stat par chemin, reutilise ensuite pour taille/hash/renommage.
+    stat_cache: Dict[Path, os.stat_result] = {}
+    video_stat = cached_stat(video_path, stat_cache) if video_path else None
+
+    if args.interactive and video_stat is None:
+        if video_path:
+            print("Fichier introuvable, reessayez.")
+        while True:
+            candidate = Path(prompt_nonempty("Chemin du fichier video: ").strip('"'))
+            video_stat = cached_stat(candidate, stat_cache)
+            if video_stat is not None:
+                video_path = candidate
+                break
+            print("Fichier introuvable, reessayez.")
+
+    if video_path is None or video_stat is None:
+        print(f"File not found: {video_path}", file=sys.stderr)
+        return 1
+
+    if not _check_hash_algo(args.hash_algo):
+        return 1
+
+    client, imdb_client = _build_clients(args)
+    try:
+        return _process_one(args, video_path, video_stat, stat_cache, client, imdb_client)
+    finally:
+        if client:
+            client.close()
+        if imdb_client:
+            imdb_client.close()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
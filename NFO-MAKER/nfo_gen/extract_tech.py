@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import os
+import re
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .utils import (
     first_present,
+    json_loads,
     normalize_language,
     parse_bytes,
     parse_duration,
@@ -19,14 +22,52 @@ from .utils import (
 )
 
 
-def _run_cmd(args: List[str]) -> Optional[str]:
-    """Execute une commande et retourne stdout si succes."""
+# Variables d'environnement pour forcer le chemin des outils.
+TOOL_ENV_OVERRIDES = {"mediainfo": "NFO_MEDIAINFO", "ffprobe": "NFO_FFPROBE"}
+
+
+# Alias MediaInfo par champ, dans l'ordre de preference.
+_MI_FILE_SIZE = ("FileSize", "FileSize_String3", "FileSize_String")
+_MI_DURATION = ("Duration", "Duration_String3", "Duration_String2", "Duration_String1")
+_MI_OVERALL_BITRATE = ("OverallBitRate", "OverallBitRate_String")
+_MI_ENCODED_DATE = ("Encoded_Date", "EncodedDate")
+_MI_CODEC = ("Format", "Format_Commercial")
+_MI_BITRATE = ("BitRate", "BitRate_String")
+_MI_ASPECT_RATIO = ("DisplayAspectRatio", "DisplayAspectRatio_String")
+_MI_CHROMA = ("ChromaSubsampling", "ChromaSubsampling_String")
+_MI_CHANNEL_LAYOUT = ("ChannelLayout", "ChannelLayout_String")
+_MI_SUB_FORMAT = ("Format", "CodecID")
+_MI_HDR = ("HDR_Format", "HDR_Format_Commercial", "HDR_Format_String", "HDR_Format_Compatibility")
+
+# Valeurs oui/non reconnues dans les champs MediaInfo.
+_BOOL_MAP = {"yes": True, "true": True, "1": True, "no": False, "false": False, "0": False}
+
+# pix_fmt ffprobe: yuv420p, yuvj422p, yuva444p10le...
+_CHROMA_RE = re.compile(r"yuv[a-z]*(\d)(\d)(\d)")
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_path(name: str) -> Optional[str]:
+    """Resout un executable une seule fois par process (cache_clear() pour relire)."""
+    override = os.environ.get(TOOL_ENV_OVERRIDES.get(name, ""))
+    found = shutil.which(override or name)
+    # Chemin absolu: pas de recherche PATH cote enfant, et condition du posix_spawn.
+    return os.path.abspath(found) if found else None
+
+
+def _run_cmd(args: List[str]) -> Optional[bytes]:
+    """Execute une commande et retourne stdout brut (bytes) si succes."""
     try:
+        # close_fds=False + chemin absolu: CPython lance via posix_spawn (vfork)
+        # au lieu de fork+exec, evitant la copie des tables de pages d'un gros process.
+        # Sans risque: Python ouvre tous ses descripteurs non heritables (PEP 446).
+        # stderr jete cote noyau: jamais lu, donc ni capture ni bufferisation.
         result = subprocess.run(
             args,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             check=False,
+            close_fds=False,
         )
     except OSError:
         return None
@@ -35,13 +76,13 @@ def _run_cmd(args: List[str]) -> Optional[str]:
     return result.stdout
 
 
-def _mi_value(track: Dict[str, Any], keys: List[str]) -> Optional[str]:
+def _mi_value(track: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[str]:
     """Recupere la premiere valeur existante dans un track MediaInfo."""
+    get = track.get
     for key in keys:
-        if key in track:
-            value = track.get(key)
-            if value not in (None, ""):
-                return str(value)
+        value = get(key)
+        if value not in (None, ""):
+            return str(value)
     return None
 
 
@@ -49,26 +90,12 @@ def _mi_bool(value: Optional[str]) -> Optional[bool]:
     """Normalise un champ oui/non MediaInfo en booleen."""
     if value is None:
         return None
-    v = str(value).strip().lower()
-    if v in ("yes", "true", "1"):
-        return True
-    if v in ("no", "false", "0"):
-        return False
-    return None
+    return _BOOL_MAP.get(str(value).strip().lower())
 
 
 def _mi_hdr(track: Dict[str, Any]) -> Optional[str]:
     """Extrait un libelle HDR depuis les champs MediaInfo connus."""
-    hdr = _mi_value(
-        track,
-        [
-            "HDR_Format",
-            "HDR_Format_Commercial",
-            "HDR_Format_String",
-            "HDR_Format_Compatibility",
-        ],
-    )
-    return hdr
+    return _mi_value(track, _MI_HDR)
 
 
 def _parse_mediainfo(data: Dict[str, Any], filename: str) -> Dict[str, Any]:
@@ -82,70 +109,62 @@ def _parse_mediainfo(data: Dict[str, Any], filename: str) -> Dict[str, Any]:
     for track in tracks:
         ttype = track.get("@type")
         if ttype == "General":
-            general["extension"] = _mi_value(track, ["FileExtension"])
+            general["extension"] = _mi_value(track, ("FileExtension",))
             general["size_bytes"] = parse_bytes(
-                _mi_value(track, ["FileSize", "FileSize_String3", "FileSize_String"])
+                _mi_value(track, _MI_FILE_SIZE)
             )
             general["duration_sec"] = parse_duration(
-                _mi_value(
-                    track,
-                    [
-                        "Duration",
-                        "Duration_String3",
-                        "Duration_String2",
-                        "Duration_String1",
-                    ],
-                )
+                _mi_value(track, _MI_DURATION)
             )
             general["overall_bitrate"] = parse_int(
-                _mi_value(track, ["OverallBitRate", "OverallBitRate_String"])
+                _mi_value(track, _MI_OVERALL_BITRATE)
             )
-            general["container"] = _mi_value(track, ["Format"])
-            general["encoded_date"] = _mi_value(track, ["Encoded_Date", "EncodedDate"])
-            general["writing_app"] = _mi_value(track, ["WritingApplication"])
-            general["writing_library"] = _mi_value(track, ["WritingLibrary"])
+            general["container"] = _mi_value(track, ("Format",))
+            general["encoded_date"] = _mi_value(track, _MI_ENCODED_DATE)
+            general["writing_app"] = _mi_value(track, ("WritingApplication",))
+            general["writing_library"] = _mi_value(track, ("WritingLibrary",))
         elif ttype == "Video":
             videos.append(
                 {
-                    "codec": _mi_value(track, ["Format", "Format_Commercial"]),
-                    "profile": _mi_value(track, ["Format_Profile"]),
-                    "bitrate": parse_int(_mi_value(track, ["BitRate", "BitRate_String"])),
-                    "width": parse_int(_mi_value(track, ["Width"])),
-                    "height": parse_int(_mi_value(track, ["Height"])),
-                    "aspect_ratio": _mi_value(track, ["DisplayAspectRatio", "DisplayAspectRatio_String"]),
-                    "frame_rate": parse_float(_mi_value(track, ["FrameRate"])),
-                    "scan_type": _mi_value(track, ["ScanType"]),
-                    "bit_depth": parse_int(_mi_value(track, ["BitDepth"])),
-                    "chroma": _mi_value(track, ["ChromaSubsampling", "ChromaSubsampling_String"]),
-                    "color_primaries": _mi_value(track, ["ColorPrimaries"]),
-                    "color_transfer": _mi_value(track, ["TransferCharacteristics"]),
-                    "color_matrix": _mi_value(track, ["MatrixCoefficients"]),
+                    "codec": _mi_value(track, _MI_CODEC),
+                    "profile": _mi_value(track, ("Format_Profile",)),
+                    "bitrate": parse_int(_mi_value(track, _MI_BITRATE)),
+                    "width": parse_int(_mi_value(track, ("Width",))),
+                    "height": parse_int(_mi_value(track, ("Height",))),
+                    "aspect_ratio": _mi_value(track, _MI_ASPECT_RATIO),
+                    "frame_rate": parse_float(_mi_value(track, ("FrameRate",))),
+                    "scan_type": _mi_value(track, ("ScanType",)),
+                    "bit_depth": parse_int(_mi_value(track, ("BitDepth",))),
+                    "chroma": _mi_value(track, _MI_CHROMA),
+                    "color_primaries": _mi_value(track, ("ColorPrimaries",)),
+                    "color_transfer": _mi_value(track, ("TransferCharacteristics",)),
+                    "color_matrix": _mi_value(track, ("MatrixCoefficients",)),
                     "hdr": _mi_hdr(track),
                 }
             )
         elif ttype == "Audio":
             audios.append(
                 {
-                    "codec": _mi_value(track, ["Format", "Format_Commercial"]),
-                    "bitrate": parse_int(_mi_value(track, ["BitRate", "BitRate_String"])),
-                    "channels": parse_int(_mi_value(track, ["Channels"])),
-                    "channel_layout": _mi_value(track, ["ChannelLayout", "ChannelLayout_String"]),
-                    "sample_rate": parse_int(_mi_value(track, ["SamplingRate"])),
-                    "language": normalize_language(_mi_value(track, ["Language"])),
-                    "title": _mi_value(track, ["Title"]),
-                    "default": _mi_bool(_mi_value(track, ["Default"])),
-                    "forced": _mi_bool(_mi_value(track, ["Forced"])),
-                    "delay_ms": parse_int(_mi_value(track, ["DelayRelativeToVideo"])),
+                    "codec": _mi_value(track, _MI_CODEC),
+                    "bitrate": parse_int(_mi_value(track, _MI_BITRATE)),
+                    "channels": parse_int(_mi_value(track, ("Channels",))),
+                    "channel_layout": _mi_value(track, _MI_CHANNEL_LAYOUT),
+                    "sample_rate": parse_int(_mi_value(track, ("SamplingRate",))),
+                    "language": normalize_language(_mi_value(track, ("Language",))),
+                    "title": _mi_value(track, ("Title",)),
+                    "default": _mi_bool(_mi_value(track, ("Default",))),
+                    "forced": _mi_bool(_mi_value(track, ("Forced",))),
+                    "delay_ms": parse_int(_mi_value(track, ("DelayRelativeToVideo",))),
                 }
             )
         elif ttype in ("Text", "Subtitle"):
             subtitles.append(
                 {
-                    "format": _mi_value(track, ["Format", "CodecID"]),
-                    "language": normalize_language(_mi_value(track, ["Language"])),
-                    "title": _mi_value(track, ["Title"]),
-                    "default": _mi_bool(_mi_value(track, ["Default"])),
-                    "forced": _mi_bool(_mi_value(track, ["Forced"])),
+                    "format": _mi_value(track, _MI_SUB_FORMAT),
+                    "language": normalize_language(_mi_value(track, ("Language",))),
+                    "title": _mi_value(track, ("Title",)),
+                    "default": _mi_bool(_mi_value(track, ("Default",))),
+                    "forced": _mi_bool(_mi_value(track, ("Forced",))),
                 }
             )
 
@@ -162,15 +181,8 @@ def _parse_chroma_from_pix_fmt(pix_fmt: Optional[str]) -> Optional[str]:
     """Derive un chroma (4:2:0) depuis un pix_fmt ffprobe."""
     if not pix_fmt:
         return None
-    m = None
-    if "yuv" in pix_fmt:
-        m = pix_fmt.split("yuv")[-1]
-    if not m:
-        return None
-    digits = "".join(ch for ch in m if ch.isdigit())
-    if len(digits) >= 3:
-        return f"{digits[0]}:{digits[1]}:{digits[2]}"
-    return None
+    m = _CHROMA_RE.search(pix_fmt)
+    return f"{m[1]}:{m[2]}:{m[3]}" if m else None
 
 
 def _parse_ffprobe(data: Dict[str, Any], filename: str) -> Dict[str, Any]:
@@ -278,29 +290,32 @@ def extract_tech(path: Path) -> Dict[str, Any]:
     """Point d'entree: preferer MediaInfo, sinon fallback ffprobe."""
     filename = path.name
     # MediaInfo est prioritaire si dispo.
-    if shutil.which("mediainfo"):
-        output = _run_cmd(["mediainfo", "--Output=JSON", str(path)])
+    mediainfo = _tool_path("mediainfo")
+    if mediainfo:
+        output = _run_cmd([mediainfo, "--Output=JSON", str(path)])
         if output:
             try:
-                return _parse_mediainfo(json.loads(output), filename)
-            except json.JSONDecodeError:
+                return _parse_mediainfo(json_loads(output), filename)
+            except ValueError:  # JSONDecodeError ou sortie non UTF-8
                 pass
     # Fallback ffprobe si MediaInfo absent/ko.
-    output = _run_cmd(
-        [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_format",
-            "-show_streams",
-            str(path),
-        ]
-    )
-    if output:
-        try:
-            return _parse_ffprobe(json.loads(output), filename)
-        except json.JSONDecodeError:
-            pass
+    ffprobe = _tool_path("ffprobe")
+    if ffprobe:
+        output = _run_cmd(
+            [
+                ffprobe,
+                "-v",
+                "quiet",
+                "-print_format",
+                "json",
+                "-show_format",
+                "-show_streams",
+                str(path),
+            ]
+        )
+        if output:
+            try:
+                return _parse_ffprobe(json_loads(output), filename)
+            except ValueError:  # JSONDecodeError ou sortie non UTF-8
+                pass
     raise RuntimeError("Unable to extract technical metadata (mediainfo/ffprobe).")
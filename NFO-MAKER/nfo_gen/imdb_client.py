@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-from .utils import get_config_dir
+from .utils import get_cache_dir, json_loads, load_config, read_json_cache, write_json_cache
+
+if TYPE_CHECKING:
+    # Comme pour TMDB: http.client n'est importe qu'a la premiere requete reseau.
+    import http.client
 
 
 OMDB_BASE_URL = "http://www.omdbapi.com/"
+# Duree de validite des reponses OMDb en cache disque.
+OMDB_CACHE_TTL = 30 * 24 * 3600
+# Reponses negatives stables, mises en cache comme les succes.
+OMDB_CACHEABLE_ERRORS = frozenset({"Movie not found!"})
 
 
 class ImdbError(RuntimeError):
@@ -24,15 +31,50 @@ class ImdbError(RuntimeError):
 class ImdbClient:
     """Client minimal OMDb: lookup par titre."""
 
-    def __init__(self, api_key: Optional[str] = None, timeout: int = 10, retries: int = 2) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: int = 10,
+        retries: int = 2,
+        cache_dir: Optional[Path] = None,
+        cache_ttl: float = OMDB_CACHE_TTL,
+    ) -> None:
         self.api_key = api_key
         self.timeout = timeout
         self.retries = retries
+        self.cache_dir = cache_dir or get_cache_dir() / "omdb"
+        self.cache_ttl = cache_ttl
+        # Connexion keep-alive ouverte a la premiere requete.
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def __enter__(self) -> "ImdbClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Ferme la connexion persistante."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Retourne la connexion persistante vers OMDb (creee a la demande)."""
+        if self._conn is None:
+            import http.client
+
+            parts = urllib.parse.urlsplit(OMDB_BASE_URL)
+            if parts.scheme == "https":
+                self._conn = http.client.HTTPSConnection(parts.netloc, timeout=self.timeout)
+            else:
+                self._conn = http.client.HTTPConnection(parts.netloc, timeout=self.timeout)
+        return self._conn
 
     @classmethod
     def from_env(cls, config_path: Optional[Path] = None) -> "ImdbClient":
         """Construit le client depuis variables env ou config.json."""
-        config = cls._load_config(config_path)
+        config = load_config(config_path)
         api_key = (
             os.environ.get("IMDB_API_KEY")
             or os.environ.get("OMDB_API_KEY")
@@ -41,42 +83,49 @@ class ImdbClient:
         )
         return cls(api_key=api_key)
 
-    @staticmethod
-    def _load_config(config_path: Optional[Path]) -> Dict[str, Any]:
-        """Charge un fichier de configuration JSON si present."""
-        if config_path:
-            candidates = [config_path]
-        else:
-            local_candidates = [
-                Path.cwd() / "config.json",
-                Path(__file__).resolve().parent / "config.json",
-            ]
-            candidates = local_candidates + [get_config_dir() / "config.json"]
-        for candidate in candidates:
-            if candidate.exists():
-                try:
-                    return json.loads(candidate.read_text(encoding="utf-8"))
-                except json.JSONDecodeError:
-                    return {}
-        return {}
+    def _cache_path(self, params: Dict[str, Any]) -> Path:
+        """Chemin de cache d'une requete (hors cle API)."""
+        key = json.dumps(sorted(params.items()), ensure_ascii=True)
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
 
     def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Envoie une requete OMDb avec retries simples."""
+        """Envoie une requete OMDb (cache disque d'abord)."""
         if not self.api_key:
             raise ImdbError("OMDb API key not configured.")
+        cache_path = self._cache_path(params)
+        cached = read_json_cache(cache_path, ttl=self.cache_ttl)
+        if cached is not None:
+            return cached
+        payload = self._fetch(params)
+        # Pas de cache pour les erreurs transitoires (cle invalide, quota...).
+        if payload.get("Response") == "True" or payload.get("Error") in OMDB_CACHEABLE_ERRORS:
+            write_json_cache(cache_path, payload)
+        return payload
+
+    def _fetch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Envoie une requete OMDb avec retries simples."""
+        import http.client
+
         params = dict(params)
         params["apikey"] = self.api_key
         query = urllib.parse.urlencode(params)
-        url = f"{OMDB_BASE_URL}?{query}"
-        request = urllib.request.Request(url)
+        target = f"{urllib.parse.urlsplit(OMDB_BASE_URL).path or '/'}?{query}"
 
         last_error: Optional[Exception] = None
         for attempt in range(self.retries + 1):
             try:
-                with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                    payload = response.read().decode("utf-8")
-                    return json.loads(payload)
-            except (urllib.error.URLError, json.JSONDecodeError) as exc:
+                conn = self._connection()
+                conn.request("GET", target, headers={"Accept": "application/json"})
+                response = conn.getresponse()
+                # Lecture complete obligatoire avant de reutiliser la connexion.
+                payload = response.read()
+                if response.status >= 400:
+                    raise ImdbError(f"HTTP {response.status} {response.reason}")
+                # Bytes directement au parseur (orjson si installe), sans decodage intermediaire.
+                return json_loads(payload)
+            except (http.client.HTTPException, OSError, ImdbError, ValueError) as exc:
+                # Connexion potentiellement cassee: on repart d'une connexion neuve.
+                self.close()
                 last_error = exc
                 if attempt < self.retries:
                     time.sleep(1)
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+import functools
+import itertools
 from pathlib import Path
 import textwrap
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from .utils import format_bitrate, format_duration, format_size, normalize_language, quality_from_resolution
 
 
+# Dossier des bannieres, resolu une fois a l'import.
+_BANNERS_DIR = Path(__file__).resolve().parent.parent / "banners"
+
 VIDEO_CODEC_MAP = {
     "avc": "H.264 (AVC)",
     "h264": "H.264 (AVC)",
@@ -34,7 +40,19 @@ def _codec_label(value: Optional[str], mapping: Dict[str, str]) -> str:
     return mapping.get(key, value)
 
 
-def _kv(key: str, value: Optional[str], width: int = 20) -> Optional[str]:
+@functools.lru_cache(maxsize=128)
+def _video_codec_label(value: Optional[str]) -> str:
+    """Libelle codec video, memoise (quelques codecs distincts par bibliotheque)."""
+    return _codec_label(value, VIDEO_CODEC_MAP)
+
+
+@functools.lru_cache(maxsize=128)
+def _audio_codec_label(value: Optional[str]) -> str:
+    """Libelle codec audio, memoise."""
+    return _codec_label(value, AUDIO_CODEC_MAP)
+
+
+def _kv(key: str, value: Optional[str]) -> Optional[str]:
     """Formatte une ligne cle/valeur."""
     if value in (None, ""):
         return None
@@ -56,42 +74,138 @@ def _channels_label(channels: Optional[int]) -> Optional[str]:
     return mapping.get(channels, str(channels))
 
 
+def _resolution(video: Dict[str, Any]) -> Optional[str]:
+    """Formate la resolution WxH si presente."""
+    width = video.get("width")
+    height = video.get("height")
+    if width and height:
+        return f"{width}x{height}"
+    return None
+
+
+def _frame_rate(video: Dict[str, Any]) -> Optional[str]:
+    """Formate le framerate avec 3 decimales."""
+    rate = video.get("frame_rate")
+    if not rate:
+        return None
+    return f"{rate:.3f} FPS" if isinstance(rate, (int, float)) else str(rate)
+
+
+def _int_unit(value: Optional[int], unit: str) -> Optional[str]:
+    """Ajoute une unite a une valeur numerique."""
+    if value is None:
+        return None
+    return f"{value} {unit}"
+
+
 def _audio_summary(audios: List[Dict[str, Any]]) -> str:
     """Resume les pistes audio pour le header."""
-    parts = []
-    for audio in audios:
-        lang = normalize_language(audio.get("language")) or "N/A"
-        codec = _codec_label(audio.get("codec"), AUDIO_CODEC_MAP)
-        channels = _channels_label(audio.get("channels")) or ""
-        if channels:
-            parts.append(f"{lang} {codec} {channels}")
-        else:
-            parts.append(f"{lang} {codec}")
-    return " + ".join(parts) if parts else "N/A"
+    if not audios:
+        return "N/A"
+    return " + ".join(
+        f"{lang} {codec} {channels}" if channels else f"{lang} {codec}"
+        for audio in audios
+        for lang, codec, channels in (
+            (
+                normalize_language(audio.get("language")) or "N/A",
+                _audio_codec_label(audio.get("codec")),
+                _channels_label(audio.get("channels")),
+            ),
+        )
+    )
 
 
 def _video_summary(videos: List[Dict[str, Any]]) -> str:
     """Resume la piste video principale pour le header."""
-    if not videos:
-        return "N/A"
-    codec = _codec_label(videos[0].get("codec"), VIDEO_CODEC_MAP)
-    return codec
-
-
-def render_nfo_sections(
+    return _video_codec_label(videos[0].get("codec")) if videos else "N/A"
+
+
+# Champs (libelle, cle, formateur) de chaque section, dans l'ordre d'affichage.
+# Une cle None passe l'element entier au formateur (champs composes).
+_GENERAL_FIELDS = (
+    ("Filename", "filename", None),
+    ("Extension", "extension", None),
+    ("File Size", "size_bytes", format_size),
+    ("Duration", "duration_sec", format_duration),
+    ("Overall Bitrate", "overall_bitrate", format_bitrate),
+    ("Container", "container", None),
+    ("Encoded Date", "encoded_date", None),
+    ("Writing App", "writing_app", None),
+    ("Writing Library", "writing_library", None),
+)
+
+_FILE_FIELDS = (
+    ("Size", "size_bytes", format_size),
+    ("Duration", "duration_sec", format_duration),
+    ("Hash", "hash", None),
+)
+# Longueur max d'une empreinte sur la ligne pointillee (SHA1); au-dela elle a sa propre ligne.
+_HASH_INLINE_MAX = 40
+
+_VIDEO_FIELDS = (
+    ("Format", "codec", _video_codec_label),
+    ("Profile", "profile", None),
+    ("Bitrate", "bitrate", format_bitrate),
+    ("Resolution", None, _resolution),
+    ("Aspect Ratio", "aspect_ratio", None),
+    ("Frame Rate", None, _frame_rate),
+    ("Scan Type", "scan_type", None),
+    ("Bit Depth", "bit_depth", functools.partial(_int_unit, unit="bits")),
+    ("Chroma", "chroma", None),
+    ("Color Primaries", "color_primaries", None),
+    ("Transfer", "color_transfer", None),
+    ("Matrix", "color_matrix", None),
+    ("HDR", "hdr", None),
+)
+
+_AUDIO_FIELDS = (
+    ("Format", "codec", _audio_codec_label),
+    ("Bitrate", "bitrate", format_bitrate),
+    ("Channels", "channels", _channels_label),
+    ("Channel Layout", "channel_layout", None),
+    ("Sample Rate", "sample_rate", functools.partial(_int_unit, unit="Hz")),
+    ("Language", "language", None),
+    ("Title", "title", None),
+    ("Default", "default", _bool_label),
+    ("Forced", "forced", _bool_label),
+    ("Delay", "delay_ms", functools.partial(_int_unit, unit="ms")),
+)
+
+_SUB_FIELDS = (
+    ("Format", "format", None),
+    ("Language", "language", None),
+    ("Title", "title", None),
+    ("Default", "default", _bool_label),
+    ("Forced", "forced", _bool_label),
+)
+
+
+@dataclass
+class _RenderContext:
+    """Donnees communes a toutes les sections (titre/annee deja resolus)."""
+    movie: Optional[Dict[str, Any]]
+    general: Dict[str, Any]
+    videos: List[Dict[str, Any]]
+    audios: List[Dict[str, Any]]
+    subtitles: List[Dict[str, Any]]
+    file_info: Dict[str, Any]
+    match_note: Optional[str]
+    title: str
+    year: Optional[int]
+    source: str
+
+
+def _build_context(
     movie: Optional[Dict[str, Any]],
     tech: Dict[str, Any],
     file_info: Dict[str, Any],
-    match_note: Optional[str] = None,
-    title_override: Optional[str] = None,
-    year_override: Optional[int] = None,
-    source_override: Optional[str] = None,
-) -> List[tuple[str, List[str]]]:
-    """Construit les sections NFO pour une verification interactive."""
-    general = tech.get("general", {})
-    videos = tech.get("videos", [])
-    audios = tech.get("audios", [])
-    subtitles = tech.get("subtitles", [])
+    match_note: Optional[str],
+    title_override: Optional[str],
+    year_override: Optional[int],
+    source_override: Optional[str],
+) -> _RenderContext:
+    """Resout titre/annee/source une seule fois pour toutes les sections."""
+    general = tech.get("general") or {}
 
     title = title_override
     year = year_override
@@ -104,175 +218,189 @@ def render_nfo_sections(
     if not title:
         title = general.get("filename") or "Unknown"
 
-    title_line = f"{title} ({year})" if year else title
+    return _RenderContext(
+        movie=movie,
+        general=general,
+        videos=tech.get("videos", []),
+        audios=tech.get("audios", []),
+        subtitles=tech.get("subtitles", []),
+        file_info=file_info,
+        match_note=match_note,
+        title=title,
+        year=year,
+        source=source_override or "N/A",
+    )
 
+
+def _header_section(ctx: _RenderContext) -> List[str]:
+    """Header compact style release."""
+    title_line = f"{ctx.title} ({ctx.year})" if ctx.year else ctx.title
+    videos = ctx.videos
     if videos:
-        resolution = quality_from_resolution(videos[0].get("height"), videos[0].get("width"))
+        main_video = videos[0]
+        resolution = quality_from_resolution(main_video.get("height"), main_video.get("width"))
     else:
         resolution = "N/A"
-    source = source_override or "N/A"
-    # Header compact style release.
     header = (
         f"{title_line}\n"
-        f"Source: {source}  |  Resolution: {resolution}  |  Video: {_video_summary(videos)}  |  "
-        f"Audio: {_audio_summary(audios)}"
+        f"Source: {ctx.source}  |  Resolution: {resolution}  |  Video: {_video_summary(videos)}  |  "
+        f"Audio: {_audio_summary(ctx.audios)}"
     )
+    return [header]
+
+
+def _render_fields(pairs: Iterable[Tuple[str, Any]]) -> List[str]:
+    """Lignes cle/valeur des paires (libelle, valeur), valeurs vides ignorees."""
+    return [f"{label}: {value}" for label, value in pairs if value not in (None, "")]
 
+
+def _field_values(
+    item: Dict[str, Any], fields: Sequence[Tuple[str, Optional[str], Optional[Callable[[Any], Any]]]]
+) -> Iterator[Tuple[str, Any]]:
+    """Paires (libelle, valeur formatee) d'un element selon sa table de champs."""
+    for label, key, fmt in fields:
+        if key is None:
+            yield label, fmt(item)
+        else:
+            value = item.get(key)
+            yield label, fmt(value) if fmt else value
+
+
+def _render_track_section(
+    title: str,
+    items: List[Dict[str, Any]],
+    fields: Sequence[Tuple[str, Optional[str], Optional[Callable[[Any], Any]]]],
+    numbered: bool = True,
+) -> List[str]:
+    """Lignes d'une section de pistes, avec en-tete "Titre #n" si numerotee."""
+    lines: List[str] = []
+    for idx, item in enumerate(items, start=1):
+        if numbered:
+            lines.append(f"{title} #{idx}")
+        lines.extend(_render_fields(_field_values(item, fields)))
+        if numbered:
+            lines.append("")
+    return lines or ["N/A"]
+
+
+def _names(items: Optional[List[Dict[str, Any]]]) -> Optional[str]:
+    """Joint les noms TMDB (genres, pays) en ignorant les entrees sans nom."""
+    return ", ".join(item["name"] for item in (items or ()) if item.get("name")) or None
+
+
+def _movie_section(ctx: _RenderContext) -> List[str]:
+    """Infos film TMDB (ou titre seul)."""
+    movie = ctx.movie
+    year = ctx.year
     movie_lines: List[str] = []
     if movie:
         movie_lines.extend(
-            filter(
-                None,
-                [
-                    _kv("Title", movie.get("title")),
-                    _kv("Original Title", movie.get("original_title")),
-                    _kv("Year", str(year) if year else None),
-                    _kv("Runtime", f"{movie.get('runtime')} min" if movie.get("runtime") else None),
-                    _kv(
-                        "Genres",
-                        ", ".join(g.get("name") for g in movie.get("genres", [])) or None,
-                    ),
-                    _kv(
-                        "Countries",
-                        ", ".join(c.get("name") for c in movie.get("production_countries", []))
-                        or None,
-                    ),
-                    _kv("TMDB URL", movie.get("tmdb_url")),
-                    _kv("IMDb URL", movie.get("imdb_url")),
-                    _kv("TMDB Match", match_note),
-                ],
+            _render_fields(
+                (
+                    ("Title", movie.get("title")),
+                    ("Original Title", movie.get("original_title")),
+                    ("Year", str(year) if year else None),
+                    ("Runtime", f"{runtime} min" if (runtime := movie.get("runtime")) else None),
+                    ("Genres", _names(movie.get("genres"))),
+                    ("Countries", _names(movie.get("production_countries"))),
+                    ("TMDB URL", movie.get("tmdb_url")),
+                    ("IMDb URL", movie.get("imdb_url")),
+                    ("TMDB Match", ctx.match_note),
+                )
             )
         )
     else:
-        movie_lines.append(_kv("Title", title) or "Title                        : N/A")
-
-    general_lines = list(
-        filter(
-            None,
-            [
-                _kv("Filename", general.get("filename")),
-                _kv("Extension", general.get("extension")),
-                _kv("File Size", format_size(general.get("size_bytes"))),
-                _kv("Duration", format_duration(general.get("duration_sec"))),
-                _kv("Overall Bitrate", format_bitrate(general.get("overall_bitrate"))),
-                _kv("Container", general.get("container")),
-                _kv("Encoded Date", general.get("encoded_date")),
-                _kv("Writing App", general.get("writing_app")),
-                _kv("Writing Library", general.get("writing_library")),
-            ],
-        )
-    )
+        movie_lines.append(_kv("Title", ctx.title) or "Title                        : N/A")
+    return movie_lines or ["N/A"]
 
-    video_lines: List[str] = []
-    if not videos:
-        video_lines.append("N/A")
-    else:
-        for idx, video in enumerate(videos, start=1):
-            if len(videos) > 1:
-                video_lines.append(f"Video #{idx}")
-            video_lines.extend(
-                filter(
-                    None,
-                    [
-                        _kv("Format", _codec_label(video.get("codec"), VIDEO_CODEC_MAP)),
-                        _kv("Profile", video.get("profile")),
-                        _kv("Bitrate", format_bitrate(video.get("bitrate"))),
-                        _kv("Resolution", _resolution(video)),
-                        _kv("Aspect Ratio", video.get("aspect_ratio")),
-                        _kv("Frame Rate", _frame_rate(video)),
-                        _kv("Scan Type", video.get("scan_type")),
-                        _kv("Bit Depth", _int_unit(video.get("bit_depth"), "bits")),
-                        _kv("Chroma", video.get("chroma")),
-                        _kv("Color Primaries", video.get("color_primaries")),
-                        _kv("Transfer", video.get("color_transfer")),
-                        _kv("Matrix", video.get("color_matrix")),
-                        _kv("HDR", video.get("hdr")),
-                    ],
-                )
-            )
-            if len(videos) > 1:
-                video_lines.append("")
 
-    audio_lines: List[str] = []
-    if not audios:
-        audio_lines.append("N/A")
-    else:
-        for idx, audio in enumerate(audios, start=1):
-            audio_lines.append(f"Audio #{idx}")
-            audio_lines.extend(
-                filter(
-                    None,
-                    [
-                        _kv("Format", _codec_label(audio.get("codec"), AUDIO_CODEC_MAP)),
-                        _kv("Bitrate", format_bitrate(audio.get("bitrate"))),
-                        _kv("Channels", _channels_label(audio.get("channels"))),
-                        _kv("Channel Layout", audio.get("channel_layout")),
-                        _kv("Sample Rate", _int_unit(audio.get("sample_rate"), "Hz")),
-                        _kv("Language", audio.get("language")),
-                        _kv("Title", audio.get("title")),
-                        _kv("Default", _bool_label(audio.get("default"))),
-                        _kv("Forced", _bool_label(audio.get("forced"))),
-                        _kv("Delay", _int_unit(audio.get("delay_ms"), "ms")),
-                    ],
-                )
-            )
-            audio_lines.append("")
+def _summary_section(ctx: _RenderContext) -> List[str]:
+    """Synopsis TMDB."""
+    overview_text = ctx.movie.get("overview") if ctx.movie else None
+    return [overview_text] if overview_text else ["N/A"]
 
-    subtitle_lines: List[str] = []
-    if not subtitles:
-        subtitle_lines.append("N/A")
-    else:
-        for idx, sub in enumerate(subtitles, start=1):
-            subtitle_lines.append(f"Subtitle #{idx}")
-            subtitle_lines.extend(
-                filter(
-                    None,
-                    [
-                        _kv("Format", sub.get("format")),
-                        _kv("Language", sub.get("language")),
-                        _kv("Title", sub.get("title")),
-                        _kv("Default", _bool_label(sub.get("default"))),
-                        _kv("Forced", _bool_label(sub.get("forced"))),
-                    ],
-                )
-            )
-            subtitle_lines.append("")
-
-    file_lines = list(
-        filter(
-            None,
-            [
-                _kv("Size", format_size(file_info.get("size_bytes"))),
-                _kv("Duration", format_duration(file_info.get("duration_sec"))),
-                _kv("Hash", file_info.get("hash")),
-            ],
-        )
+
+def _general_section(ctx: _RenderContext) -> List[str]:
+    """Infos conteneur."""
+    return _render_fields(_field_values(ctx.general, _GENERAL_FIELDS)) or ["N/A"]
+
+
+def _video_section(ctx: _RenderContext) -> List[str]:
+    """Pistes video (numerotees seulement s'il y en a plusieurs)."""
+    videos = ctx.videos
+    return _render_track_section("Video", videos, _VIDEO_FIELDS, numbered=len(videos) > 1)
+
+
+def _audio_section(ctx: _RenderContext) -> List[str]:
+    """Pistes audio."""
+    return _render_track_section("Audio", ctx.audios, _AUDIO_FIELDS)
+
+
+def _subtitles_section(ctx: _RenderContext) -> List[str]:
+    """Pistes sous-titres."""
+    return _render_track_section("Subtitle", ctx.subtitles, _SUB_FIELDS)
+
+
+def _file_section(ctx: _RenderContext) -> List[str]:
+    """Taille/duree/hash du fichier."""
+    lines = _render_fields(_field_values(ctx.file_info, _FILE_FIELDS))
+    algo, _, digest = str(ctx.file_info.get("hash") or "").partition(" ")
+    if len(digest) > _HASH_INLINE_MAX:
+        # SHA256/BLAKE3: l'empreinte seule, centree, pour ne jamais etre tronquee.
+        lines[-1:] = [f"Hash: {algo}", digest]
+    return lines or ["N/A"]
+
+
+# Sections du NFO, dans l'ordre de rendu.
+SECTION_BUILDERS: Dict[str, Callable[[_RenderContext], List[str]]] = {
+    "Header": _header_section,
+    "Movie": _movie_section,
+    "Summary": _summary_section,
+    "General": _general_section,
+    "Video": _video_section,
+    "Audio": _audio_section,
+    "Subtitles": _subtitles_section,
+    "File": _file_section,
+}
+
+
+def render_nfo_section(
+    name: str,
+    movie: Optional[Dict[str, Any]],
+    tech: Dict[str, Any],
+    file_info: Dict[str, Any],
+    match_note: Optional[str] = None,
+    title_override: Optional[str] = None,
+    year_override: Optional[int] = None,
+    source_override: Optional[str] = None,
+) -> List[str]:
+    """Construit une seule section (refresh interactif sans tout reconstruire)."""
+    ctx = _build_context(
+        movie, tech, file_info, match_note, title_override, year_override, source_override
     )
+    return SECTION_BUILDERS[name](ctx)
 
-    overview_text = movie.get("overview") if movie else None
-    summary_lines = [overview_text] if overview_text else ["N/A"]
 
-    return [
-        ("Header", [header]),
-        ("Movie", movie_lines or ["N/A"]),
-        ("Summary", summary_lines),
-        ("General", general_lines or ["N/A"]),
-        ("Video", video_lines or ["N/A"]),
-        ("Audio", audio_lines or ["N/A"]),
-        ("Subtitles", subtitle_lines or ["N/A"]),
-        ("File", file_lines or ["N/A"]),
-    ]
+def render_nfo_sections(
+    movie: Optional[Dict[str, Any]],
+    tech: Dict[str, Any],
+    file_info: Dict[str, Any],
+    match_note: Optional[str] = None,
+    title_override: Optional[str] = None,
+    year_override: Optional[int] = None,
+    source_override: Optional[str] = None,
+) -> List[tuple[str, List[str]]]:
+    """Construit les sections NFO pour une verification interactive."""
+    ctx = _build_context(
+        movie, tech, file_info, match_note, title_override, year_override, source_override
+    )
+    return [(name, builder(ctx)) for name, builder in SECTION_BUILDERS.items()]
 
 
-def render_nfo_from_sections(sections: List[tuple[str, List[str]]]) -> str:
-    """Construit le NFO complet en appliquant header/footer/separateurs."""
-    header_banner = _read_banner("header.txt")
-    footer_banner = _read_banner("footer.txt")
+def _iter_body_lines(sections: List[tuple[str, List[str]]]) -> Iterator[str]:
+    """Produit les lignes du header et des sections, sans le footer."""
     separator_template = _read_banner("separator.txt")
-
-    lines: List[str] = []
-    if header_banner:
-        lines.extend(header_banner)
+    yield from _read_banner("header.txt")
 
     for name, section_lines in sections:
         if name == "Header":
@@ -284,17 +412,17 @@ def render_nfo_from_sections(sections: List[tuple[str, List[str]]]) -> str:
                 use_dots=False,
                 add_pad_lines=False,
             )
-            lines.extend(framed_header if framed_header else section_lines)
+            yield from framed_header if framed_header else section_lines
 
     for name, section_lines in sections:
         if name == "Header":
             continue
         separator = _build_separator(name, separator_template)
         if separator:
-            lines.extend(separator)
+            yield from separator
         else:
-            lines.append(name)
-        framed_lines = _frame_section_lines(
+            yield name
+        yield from _frame_section_lines(
             section_lines,
             separator_template,
             wrap=(name == "Summary"),
@@ -302,14 +430,24 @@ def render_nfo_from_sections(sections: List[tuple[str, List[str]]]) -> str:
             use_dots=(name != "Summary"),
             add_pad_lines=True,
         )
-        lines.extend(framed_lines)
 
+
+def _iter_nfo_lines(sections: List[tuple[str, List[str]]]) -> Iterator[str]:
+    """Produit les lignes du NFO une par une, footer compris."""
+    last = None
+    for last in _iter_body_lines(sections):
+        yield last
+    footer_banner = _read_banner("footer.txt")
     if footer_banner:
-        if lines and lines[-1] != "":
-            lines.append("")
-        lines.extend(footer_banner)
+        if last is not None and last != "":
+            yield ""
+        yield from footer_banner
+
 
-    return "\n".join(line for line in lines if line is not None).rstrip() + "\n"
+def render_nfo_from_sections(sections: List[tuple[str, List[str]]]) -> str:
+    """Construit le NFO complet en appliquant header/footer/separateurs."""
+    # Les builders de section ne produisent que des str: pas de filtrage a la jointure.
+    return "\n".join(_iter_nfo_lines(sections)).rstrip() + "\n"
 
 
 def render_nfo(
@@ -334,41 +472,18 @@ def render_nfo(
     return render_nfo_from_sections(sections)
 
 
-def _resolution(video: Dict[str, Any]) -> Optional[str]:
-    """Formate la resolution WxH si presente."""
-    width = video.get("width")
-    height = video.get("height")
-    if width and height:
-        return f"{width}x{height}"
-    return None
-
-
-def _frame_rate(video: Dict[str, Any]) -> Optional[str]:
-    """Formate le framerate avec 3 decimales."""
-    rate = video.get("frame_rate")
-    if not rate:
-        return None
-    return f"{rate:.3f} FPS" if isinstance(rate, (int, float)) else str(rate)
-
-
-def _int_unit(value: Optional[int], unit: str) -> Optional[str]:
-    """Ajoute une unite a une valeur numerique."""
-    if value is None:
-        return None
-    return f"{value} {unit}"
-
-
-def _read_banner(name: str) -> List[str]:
-    """Lit un fichier de bannieres (header/footer/separator) si present."""
-    banners_dir = Path(__file__).resolve().parent.parent / "banners"
-    banner_path = banners_dir / name
+@functools.lru_cache(maxsize=None)
+def _read_banner(name: str) -> Tuple[str, ...]:
+    """Lit un fichier de bannieres (header/footer/separator) si present, une fois par process."""
+    banner_path = _BANNERS_DIR / name
     if not banner_path.exists():
-        return []
+        return ()
     content = banner_path.read_text(encoding="utf-8")
-    return content.splitlines()
+    # Tuple: le resultat memoise est partage, il ne doit pas etre modifie.
+    return tuple(content.splitlines())
 
 
-def _build_separator(title: str, template_lines: List[str]) -> List[str]:
+def _build_separator(title: str, template_lines: Sequence[str]) -> List[str]:
     """Construit un separateur centre avec le titre de section."""
     if len(template_lines) < 3:
         return []
@@ -383,56 +498,59 @@ def _build_separator(title: str, template_lines: List[str]) -> List[str]:
 
 def _frame_section_lines(
     lines: List[str],
-    template_lines: List[str],
+    template_lines: Sequence[str],
     wrap: bool = False,
     pad: int = 0,
     use_dots: bool = True,
     add_pad_lines: bool = True,
 ) -> List[str]:
     """Encadre les lignes avec des motifs alternes gauche/droite."""
-    if len(template_lines) < 4:
+    params = _frame_params(tuple(template_lines), pad)
+    if params is None:
         return list(lines)
-    motifs = _extract_motifs(template_lines[3:])
-    if not motifs:
-        return list(lines)
-    width = len(template_lines[0])
-    sample_left, sample_right = motifs[0]
-    inner_width = width - len(sample_left) - len(sample_right) - (pad * 2)
+    affixes, inner_width = params
+    wrapper = _text_wrapper(inner_width) if wrap else None
+    # Motifs alternes ligne apres ligne, sans index ni modulo.
+    affix_cycle = itertools.cycle(affixes)
     framed: List[str] = []
-    line_idx = 0
-    pad_token = object()
+    append = framed.append
     cleaned = [line for line in lines if line and line.strip()]
-    if add_pad_lines:
-        render_lines = [pad_token] + cleaned + [pad_token]
-    else:
-        render_lines = cleaned
+    # Les lignes de marge sont simplement des lignes vides encadrees.
+    render_lines = ["", *cleaned, ""] if add_pad_lines else cleaned
     for line in render_lines:
-        if line == pad_token:
-            chunks = [""]
-            line = ""
-        else:
-            line = line or ""
-        if wrap:
-            chunks = textwrap.wrap(
-                line,
-                width=inner_width,
-                break_long_words=False,
-                break_on_hyphens=False,
-            )
-            if not chunks:
-                chunks = [""]
-        else:
-            chunks = [line]
+        chunks = (wrapper.wrap(line) or [""]) if wrapper else (line,)
         for chunk in chunks:
-            left, right = motifs[line_idx % len(motifs)]
-            safe_line = _format_line(chunk, inner_width, use_dots=use_dots and ":" in chunk)
-            pad_str = " " * pad
-            framed.append(f"{left}{pad_str}{safe_line}{pad_str}{right}")
-            line_idx += 1
+            prefix, suffix = next(affix_cycle)
+            # _format_line ne pointille que les lignes contenant ":".
+            append(prefix + _format_line(chunk, inner_width, use_dots) + suffix)
     return framed
 
 
-def _extract_motifs(lines: List[str]) -> List[tuple[str, str]]:
+@functools.lru_cache(maxsize=8)
+def _text_wrapper(width: int) -> textwrap.TextWrapper:
+    """TextWrapper reutilisable par largeur (evite sa reconstruction a chaque ligne)."""
+    return textwrap.TextWrapper(width=width, break_long_words=False, break_on_hyphens=False)
+
+
+@functools.lru_cache(maxsize=16)
+def _frame_params(
+    template_lines: Tuple[str, ...], pad: int
+) -> Optional[Tuple[Tuple[Tuple[str, str], ...], int]]:
+    """Affixes (gauche+marge, marge+droite) et largeur utile d'un cadre (None si inutilisable)."""
+    if len(template_lines) < 4:
+        return None
+    motifs = tuple(_extract_motifs(template_lines[3:]))
+    if not motifs:
+        return None
+    width = len(template_lines[0])
+    sample_left, sample_right = motifs[0]
+    inner_width = width - len(sample_left) - len(sample_right) - (pad * 2)
+    pad_str = " " * pad
+    affixes = tuple((left + pad_str, pad_str + right) for left, right in motifs)
+    return affixes, inner_width
+
+
+def _extract_motifs(lines: Sequence[str]) -> List[tuple[str, str]]:
     """Extrait les motifs gauche/droite depuis les lignes du template."""
     motifs: List[tuple[str, str]] = []
     for line in lines:
@@ -453,14 +571,13 @@ def _format_line(line: str, width: int, use_dots: bool = True) -> str:
         if not value:
             text = key[:width]
             return text.center(width)
-        left_pad = " " * 5
-        right_pad = " " * 5
-        usable = width - len(left_pad) - len(right_pad)
+        # 5 espaces de marge de chaque cote.
+        usable = width - 10
         key = key[:usable]
         value = value[:usable]
         dot_width = max(2, usable - len(key) - len(value))
-        dots = "." * dot_width
-        combined = f"{left_pad}{key}{dots}{value}{right_pad}"
-        return combined[:width].ljust(width)
+        combined = f"{'':5}{key}{'.' * dot_width}{value}{'':5}"
+        # Tronque et complete a width en une seule operation de formatage.
+        return f"{combined:<{width}.{width}}"
     text = line[:width]
     return text.center(width)
@@ -5,11 +5,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .utils import LANG_MAP
 
 
 # Tokens techniques courants a ignorer pour isoler le titre.
-TAG_TOKENS = {
+TAG_TOKENS = frozenset({
     "1080p",
     "2160p",
     "720p",
@@ -60,66 +62,98 @@ TAG_TOKENS = {
     "vfi",
     "vf",
     "vff",
-}
+})
 
-# Mots cles de langue a detecter dans le nom de fichier.
+# Mots cles de langue a detecter dans le nom de fichier (libelles partages avec LANG_MAP).
+# Sous-ensemble volontaire: des codes courts comme "ja" ou "chi" restent des mots du titre.
 LANG_TOKENS = {
-    "fr": "FR",
-    "french": "FR",
-    "en": "EN",
-    "eng": "EN",
-    "english": "EN",
-    "es": "ES",
-    "spa": "ES",
-    "de": "DE",
-    "ger": "DE",
-    "ita": "IT",
-    "it": "IT",
+    **{
+        token: LANG_MAP[token]
+        for token in ("fr", "french", "en", "eng", "english", "es", "spa", "de", "ger", "ita", "it")
+    },
     "multi": "MULTI",
 }
 
-# Regex simples pour annee et resolution.
-YEAR_RE = re.compile(r"^(19|20)\d{2}$")
-RESOLUTION_RE = re.compile(r"^\d{3,4}p$")
+# Table unique token -> (type, langue): une seule recherche par token.
+# Les langues passent apres les tags pour garder leur priorite ("multi").
+TOKEN_TABLE: Dict[str, Tuple[str, Optional[str]]] = {
+    **{token: ("tag", None) for token in TAG_TOKENS},
+    **{token: ("lang", lang) for token, lang in LANG_TOKENS.items()},
+}
+
 AUDIO_TOKEN_RE = re.compile(r"^(?:ac3|eac3|ddp|dts|aac|truehd)(?:\d+(?:\.\d+)?)?ch?$")
+# Suffixe "<tag>-GROUPE" final (x264-GRP), detecte avant la normalisation des separateurs.
+GROUP_RE = re.compile(r"([^\s._-]+)-([^\s._-]+)$")
+SEPARATOR_RE = re.compile(r"[._-]")
+# Blocs [..] (..) {..}, retires en une seule passe (le groupe final releve de GROUP_RE).
+STRIP_RE = re.compile(r"[\[\(\{].*?[\]\)\}]")
+TOKEN_RE = re.compile(r"\S+")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedName:
     title: str
     year: Optional[int]
-    languages: List[str]
+    languages: Tuple[str, ...]
     raw: str
 
 
+def _digit_token_kind(lower: str) -> Optional[str]:
+    """"year" (19xx/20xx), "resolution" (720p...) ou None pour un token en minuscules."""
+    # Seuls les tokens commencant par un chiffre peuvent etre une annee ou une resolution.
+    if not lower[:1].isdecimal():
+        return None
+    # Tests sans regex (isdecimal: memes chiffres que \d).
+    if len(lower) == 4 and lower[:2] in ("19", "20") and lower.isdecimal():
+        return "year"
+    if lower[-1:] == "p" and 4 <= len(lower) <= 5 and lower[:-1].isdecimal():
+        return "resolution"
+    return None
+
+
+def _is_tech_token(lower: str) -> bool:
+    """Vrai si le token (minuscules) est une annee, un tag, une langue ou un format."""
+    if lower in TOKEN_TABLE or _digit_token_kind(lower) is not None:
+        return True
+    return AUDIO_TOKEN_RE.match(lower) is not None
+
+
 def parse_filename(filename: str) -> ParsedName:
     """Extrait un titre, une annee et des langues depuis le nom."""
     base = Path(filename).stem
+    # Groupe de release colle au dernier tag (AC3-mHDgz): retire avant que "-" devienne un espace.
+    # Un titre compose (Spider-Man) n'est pas touche car "spider" n'est pas un tag, ni un
+    # suffixe qui est lui-meme une info (FR-EN, bdrip-multi, 2160p-2019).
+    group = GROUP_RE.search(base)
+    if (
+        group
+        and _is_tech_token(group.group(1).lower())
+        and not _is_tech_token(group.group(2).lower())
+    ):
+        base = base[: group.end(1)]
     # Normalise les separateurs typiques.
-    base = base.replace(".", " ").replace("_", " ").replace("-", " ")
+    base = SEPARATOR_RE.sub(" ", base)
     # Supprime les blocs entre crochets/parentheses.
-    base = re.sub(r"[\[\(\{].*?[\]\)\}]", " ", base)
-    # Supprime les suffixes type groupe apres un tiret final (avec espaces).
-    base = re.sub(r"\s+-\s+[^-]+$", " ", base)
-    tokens = [t for t in base.split() if t]
+    base = STRIP_RE.sub(" ", base)
 
     year = None
     languages: List[str] = []
     cleaned: List[str] = []
 
-    for token in tokens:
+    for match in TOKEN_RE.finditer(base):
+        token = match.group()
         lower = token.lower()
-        if YEAR_RE.match(lower) and year is None:
+        digit_kind = _digit_token_kind(lower)
+        if digit_kind == "year" and year is None:
             year = int(lower)
             continue
-        if lower in LANG_TOKENS:
-            lang = LANG_TOKENS[lower]
-            if lang not in languages:
-                languages.append(lang)
+        if digit_kind == "resolution":
             continue
-        if lower in TAG_TOKENS:
-            continue
-        if RESOLUTION_RE.match(lower):
+        info = TOKEN_TABLE.get(lower)
+        if info is not None:
+            kind, lang = info
+            if kind == "lang" and lang not in languages:
+                languages.append(lang)
             continue
         if AUDIO_TOKEN_RE.match(lower):
             continue
@@ -128,4 +162,4 @@ def parse_filename(filename: str) -> ParsedName:
     title = " ".join(cleaned).strip()
     if not title:
         title = Path(filename).stem
-    return ParsedName(title=title, year=year, languages=languages, raw=filename)
+    return ParsedName(title=title, year=year, languages=tuple(languages), raw=filename)
@@ -2,27 +2,40 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
-from .utils import ensure_dir, get_cache_dir, get_config_dir
+from .utils import get_cache_dir, json_loads, load_config, read_json_cache, write_json_cache
+
+if TYPE_CHECKING:
+    # http.client (et email.*) n'est importe qu'a la premiere requete reseau.
+    import http.client
 
 
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
+# Statuts HTTP transitoires pour lesquels la requete est retentee.
+TMDB_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# Duree de validite des reponses TMDB (recherche, details) en cache disque.
+TMDB_CACHE_TTL = 7 * 24 * 3600
+# Nombre de reponses gardees en memoire devant le cache disque.
+TMDB_MEMORY_CACHE_SIZE = 256
+# En-tetes de validation conserves pour revalider une entree expiree (reponse -> requete).
+TMDB_VALIDATOR_HEADERS = (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since"))
 
 
 class TmdbError(RuntimeError):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """Representation simplifiee d'un resultat TMDB."""
     tmdb_id: int
@@ -32,6 +45,15 @@ class SearchResult:
     score: float
 
 
+def _purge_legacy_cache(cache_root: Path) -> None:
+    """Supprime les fichiers de l'ancien cache TMDB (tmdb_<id>_<lang>.json), devenus orphelins."""
+    for path in cache_root.glob("tmdb_*_*.json"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
 class TmdbClient:
     """Client TMDB minimal: search/movie + movie details."""
     def __init__(
@@ -41,88 +63,203 @@ class TmdbClient:
         cache_dir: Optional[Path] = None,
         timeout: int = 10,
         retries: int = 2,
+        cache_ttl: float = TMDB_CACHE_TTL,
     ) -> None:
         self.token = token
         self.api_key = api_key
-        self.cache_dir = cache_dir or get_cache_dir()
+        if cache_dir is None:
+            cache_dir = get_cache_dir() / "tmdb"
+            if not cache_dir.is_dir():
+                _purge_legacy_cache(cache_dir.parent)
+        self.cache_dir = cache_dir
         self.timeout = timeout
         self.retries = retries
+        self.cache_ttl = cache_ttl
+        # Prefixe de chemin et en-tetes communs a toutes les requetes, construits une fois.
+        self._base_path = urllib.parse.urlsplit(TMDB_BASE_URL).path
+        self._base_headers = {"Accept": "application/json"}
+        if token:
+            self._base_headers["Authorization"] = f"Bearer {token}"
+        # (date, reponse decodee) par chemin de cache (LRU, partage entre threads).
+        self._memory: "OrderedDict[Path, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        # Une connexion keep-alive par thread, ouverte a sa premiere requete.
+        self._local = threading.local()
+        self._conns: List[http.client.HTTPConnection] = []
+        self._conns_lock = threading.Lock()
+
+    def __enter__(self) -> "TmdbClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Ferme toutes les connexions persistantes (tous threads confondus)."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Retourne la connexion persistante du thread courant (creee a la demande)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import http.client
+
+            parts = urllib.parse.urlsplit(TMDB_BASE_URL)
+            if parts.scheme == "https":
+                conn = http.client.HTTPSConnection(parts.netloc, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(parts.netloc, timeout=self.timeout)
+            with self._conns_lock:
+                self._conns.append(conn)
+                self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        """Ferme la connexion du thread courant (les autres threads la gardent)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        with self._conns_lock:
+            self._local.conn = None
+            if conn in self._conns:
+                self._conns.remove(conn)
+        conn.close()
 
     @classmethod
     def from_env(cls, config_path: Optional[Path] = None) -> "TmdbClient":
         """Construit le client depuis variables env ou config.json."""
-        config = cls._load_config(config_path)
+        config = load_config(config_path)
         token = os.environ.get("TMDB_TOKEN") or config.get("tmdb_token")
         api_key = os.environ.get("TMDB_API_KEY") or config.get("tmdb_api_key")
         return cls(token=token, api_key=api_key)
 
-    @staticmethod
-    def _load_config(config_path: Optional[Path]) -> Dict[str, Any]:
-        """Charge un fichier de configuration JSON si present."""
-        if config_path:
-            candidates = [config_path]
-        else:
-            local_candidates = [
-                Path.cwd() / "config.json",
-                Path(__file__).resolve().parent / "config.json",
-            ]
-            candidates = local_candidates + [get_config_dir() / "config.json"]
-        for candidate in candidates:
-            if candidate.exists():
-                try:
-                    return json.loads(candidate.read_text(encoding="utf-8"))
-                except json.JSONDecodeError:
-                    return {}
-        return {}
+    def _cache_path(self, path: str, params: Dict[str, Any]) -> Path:
+        """Chemin de cache d'une requete (hors cle API)."""
+        key = json.dumps([path, sorted(params.items())], ensure_ascii=True)
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
 
     def _request(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Envoie une requete TMDB avec retries simples."""
+        """Envoie une requete TMDB (cache memoire, puis disque, puis reseau)."""
         if not (self.token or self.api_key):
             raise TmdbError("TMDB token or API key not configured.")
         params = params or {}
-        if self.api_key:
-            params["api_key"] = self.api_key
-        query = urllib.parse.urlencode(params)
-        url = f"{TMDB_BASE_URL}{path}"
-        if query:
-            url = f"{url}?{query}"
-        headers = {"Accept": "application/json"}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        request = urllib.request.Request(url, headers=headers)
+        cache_path = self._cache_path(path, params)
+        with self._memory_lock:
+            entry = self._memory.get(cache_path)
+            if entry is not None:
+                if time.time() - entry[0] > self.cache_ttl:
+                    # Meme TTL que le disque: une entree expiree est relue ou revalidee.
+                    del self._memory[cache_path]
+                    entry = None
+                else:
+                    self._memory.move_to_end(cache_path)
+        if entry is None:
+            cached = read_json_cache(cache_path, ttl=self.cache_ttl)
+            if cached is None:
+                cached = self._request_network(path, params, cache_path)
+                fetched_at = time.time()
+            else:
+                try:
+                    fetched_at = cache_path.stat().st_mtime
+                except OSError:
+                    fetched_at = time.time()
+            entry = (fetched_at, cached)
+            self._remember(cache_path, entry)
+        # Copie de surface: l'appelant peut completer le dict (tmdb_url...) sans toucher au cache.
+        return dict(entry[1])
+
+    def _remember(self, cache_path: Path, entry: Tuple[float, Dict[str, Any]]) -> None:
+        """Ajoute une reponse datee au cache memoire (evince la plus ancienne au-dela)."""
+        with self._memory_lock:
+            self._memory[cache_path] = entry
+            self._memory.move_to_end(cache_path)
+            if len(self._memory) > TMDB_MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+
+    def _request_network(self, path: str, params: Dict[str, Any], cache_path: Path) -> Dict[str, Any]:
+        """Telecharge (ou revalide) une entree expiree ou absente du cache disque."""
+        # Entree expiree: requete conditionnelle si ses validateurs ont ete conserves.
+        validators_path = cache_path.with_suffix(".validators")
+        stale = read_json_cache(cache_path)
+        validators = read_json_cache(validators_path) if stale is not None else None
+        payload, new_validators = self._fetch(path, params, validators)
+        if payload is None:
+            # 304 Not Modified (seulement possible avec une entree en cache): on la rafraichit.
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return stale
+        write_json_cache(cache_path, payload)
+        if new_validators:
+            write_json_cache(validators_path, new_validators)
+        return payload
+
+    def _fetch(
+        self, path: str, params: Dict[str, Any], validators: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """Envoie une requete TMDB sur la connexion persistante, avec retries simples.
+
+        Retourne (reponse, validateurs); reponse None si le serveur repond 304.
+        """
+        import http.client
+
+        target = f"{self._base_path}{path}"
+        if params or self.api_key:
+            if self.api_key:
+                params = {**params, "api_key": self.api_key}
+            target = f"{target}?{urllib.parse.urlencode(params)}"
+        headers = self._base_headers
+        if validators:
+            headers = dict(headers)
+            for response_header, request_header in TMDB_VALIDATOR_HEADERS:
+                if validators.get(response_header):
+                    headers[request_header] = validators[response_header]
 
         last_error: Optional[Exception] = None
         for attempt in range(self.retries + 1):
             try:
-                with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                    payload = response.read().decode("utf-8")
-                    return json.loads(payload)
-            except (urllib.error.URLError, json.JSONDecodeError) as exc:
+                conn = self._connection()
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                # Lecture complete obligatoire avant de reutiliser la connexion.
+                payload = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                # Connexion potentiellement cassee: on repart d'une connexion neuve.
+                self._drop_connection()
                 last_error = exc
-                if attempt < self.retries:
-                    time.sleep(1)
-                    continue
-                break
+            else:
+                if response.status == 304 and validators:
+                    return None, {}
+                if response.status < 400:
+                    new_validators = {
+                        name: value
+                        for name, _ in TMDB_VALIDATOR_HEADERS
+                        if (value := response.getheader(name))
+                    }
+                    try:
+                        # Bytes directement au parseur (orjson si installe), sans decodage intermediaire.
+                        return json_loads(payload), new_validators
+                    except ValueError as exc:
+                        raise TmdbError(f"TMDB request failed: {exc}") from exc
+                last_error = TmdbError(f"HTTP {response.status} {response.reason}")
+                if response.status not in TMDB_RETRY_STATUSES:
+                    break
+            if attempt < self.retries:
+                time.sleep(1)
         raise TmdbError(f"TMDB request failed: {last_error}")
 
-    def _cache_path(self, movie_id: int, lang: Optional[str]) -> Path:
-        """Construit le chemin de cache pour un film/langue."""
-        suffix = lang or "default"
-        return self.cache_dir / f"tmdb_{movie_id}_{suffix}.json"
-
     def get_movie(self, movie_id: int, lang: Optional[str] = None) -> Dict[str, Any]:
         """Recupere un film (cache si dispo)."""
-        cache_path = self._cache_path(movie_id, lang)
-        if cache_path.exists():
-            try:
-                return json.loads(cache_path.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                pass
-        params = {"language": lang} if lang else {}
-        payload = self._request(f"/movie/{movie_id}", params=params)
-        ensure_dir(self.cache_dir)
-        cache_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
-        return payload
+        # external_ids inclus dans la meme reponse: evite un aller-retour pour l'IMDb id.
+        params = {"append_to_response": "external_ids"}
+        if lang:
+            params["language"] = lang
+        return self._request(f"/movie/{movie_id}", params=params)
 
     def get_external_ids(self, movie_id: int) -> Dict[str, Any]:
         """Recupere les ids externes (IMDb, etc.)."""
@@ -190,6 +327,26 @@ class TmdbClient:
             def score(result: SearchResult) -> float:
                 boost = 5.0 if year and result.year == year else 0.0
                 return result.score + boost
-            picked = sorted(results, key=score, reverse=True)[0]
+            # En cas d'egalite, max garde le premier resultat (ordre de pertinence TMDB).
+            picked = max(results, key=score)
         match_note = f"{picked.tmdb_id} {picked.title} ({picked.year or 'N/A'})"
         return self.get_movie(picked.tmdb_id, lang=lang), match_note
+
+    def resolve_many(
+        self,
+        items: Iterable[Tuple[Optional[int], Optional[str], Optional[int], Optional[str]]],
+        max_workers: int = 8,
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Resout plusieurs films (tmdb_id, titre, annee, langue) en parallele, dans l'ordre."""
+        items = list(items)
+        if not items:
+            return []
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(
+                executor.map(
+                    lambda item: self.resolve_movie(*item, interactive=False),
+                    items,
+                )
+            )
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import importlib
+import json
+import mmap
 import os
 import re
+import threading
+import time
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, Tuple, Union
 
 
 LANG_MAP = {
@@ -30,19 +36,66 @@ LANG_MAP = {
     "zho": "ZH",
 }
 
+class _NonDecimalTable(dict):
+    """Table str.translate qui supprime tout caractere non decimal (rempli a la demande)."""
+
+    def __missing__(self, code: int) -> Optional[int]:
+        # Memes chiffres que \d (categorie Nd, ASCII ou non); None = caractere supprime.
+        value = code if chr(code).isdecimal() else None
+        self[code] = value
+        return value
+
+
+_NON_DECIMAL = _NonDecimalTable()
+
+# Motifs des parseurs de valeurs MediaInfo, compiles une fois.
+_BYTES_RE = re.compile(r"([0-9.]+)\s*([KMGTP]?i?B)", re.IGNORECASE)
+# Multiplicateur par unite (minuscules); B/iB et inconnues valent 1.
+_BYTE_UNITS = {
+    "kb": 1024,
+    "kib": 1024,
+    "mb": 1024 ** 2,
+    "mib": 1024 ** 2,
+    "gb": 1024 ** 3,
+    "gib": 1024 ** 3,
+    "tb": 1024 ** 4,
+    "tib": 1024 ** 4,
+    "pb": 1024 ** 5,
+    "pib": 1024 ** 5,
+}
+_DURATION_RES = (
+    ("h", re.compile(r"(\d+)\s*h", re.IGNORECASE)),
+    ("m", re.compile(r"(\d+)\s*min", re.IGNORECASE)),
+    ("s", re.compile(r"(\d+)\s*s", re.IGNORECASE)),
+)
+
+# Taille du tampon de lecture reutilise pour le hash en flux (4x celui de hashlib.file_digest).
+HASH_CHUNK_SIZE = 1024 * 1024
+# Au-dela de ce seuil, mmap bat la lecture par blocs; en dessous son cout d'installation domine.
+HASH_MMAP_THRESHOLD = 8 * 1024 * 1024
+HASH_MMAP_SLICE = 16 * 1024 * 1024
+
+# Hashes non cryptographiques fournis par des paquets optionnels: algo -> (module, constructeur).
+OPTIONAL_HASHES = {
+    "blake3": ("blake3", "blake3"),
+    "xxh3": ("xxhash", "xxh3_64"),
+    "xxh64": ("xxhash", "xxh64"),
+}
+
 
 def normalize_language(value: Optional[str]) -> Optional[str]:
     """Normalise un code langue en version courte (FR/EN/etc.)."""
     if not value:
         return None
+    # Chemin rapide: code deja propre (ex: "fre" de MediaInfo), sans str/strip/lower.
+    if isinstance(value, str):
+        short = LANG_MAP.get(value)
+        if short is not None:
+            return short
     v = str(value).strip().lower()
     if not v:
         return None
-    if v in LANG_MAP:
-        return LANG_MAP[v]
-    if len(v) == 2:
-        return v.upper()
-    return v.upper()
+    return LANG_MAP.get(v) or v.upper()
 
 
 def parse_rational(value: Optional[str]) -> Optional[float]:
@@ -74,11 +127,8 @@ def parse_int(value: Optional[object]) -> Optional[int]:
         return None
     if isinstance(value, (int, float)):
         return int(value)
-    s = str(value)
-    digits = re.findall(r"\d+", s)
-    if not digits:
-        return None
-    return int("".join(digits))
+    digits = str(value).translate(_NON_DECIMAL)
+    return int(digits) if digits else None
 
 
 def parse_float(value: Optional[object]) -> Optional[float]:
@@ -105,23 +155,11 @@ def parse_bytes(value: Optional[object]) -> Optional[int]:
         return None
     if s.isdigit():
         return int(s)
-    m = re.search(r"([0-9.]+)\s*([KMGTP]?i?B)", s, re.IGNORECASE)
+    m = _BYTES_RE.search(s)
     if not m:
         return parse_int(s)
     number = float(m.group(1))
-    unit = m.group(2).lower()
-    factor = 1
-    if unit in ("kb", "kib"):
-        factor = 1024
-    elif unit in ("mb", "mib"):
-        factor = 1024 ** 2
-    elif unit in ("gb", "gib"):
-        factor = 1024 ** 3
-    elif unit in ("tb", "tib"):
-        factor = 1024 ** 4
-    elif unit in ("pb", "pib"):
-        factor = 1024 ** 5
-    return int(number * factor)
+    return int(number * _BYTE_UNITS.get(m.group(2).lower(), 1))
 
 
 def parse_duration(value: Optional[object]) -> Optional[float]:
@@ -138,8 +176,8 @@ def parse_duration(value: Optional[object]) -> Optional[float]:
     if s.isdigit():
         return float(s) / 1000.0
     parts = {"h": 0, "m": 0, "s": 0}
-    for key, pattern in (("h", r"(\d+)\s*h"), ("m", r"(\d+)\s*min"), ("s", r"(\d+)\s*s")):
-        m = re.search(pattern, s, re.IGNORECASE)
+    for key, pattern in _DURATION_RES:
+        m = pattern.search(s)
         if m:
             parts[key] = int(m.group(1))
     if any(parts.values()):
@@ -183,37 +221,134 @@ def format_bitrate(bits_per_sec: Optional[int]) -> str:
     return f"{int(round(bits_per_sec / 1000.0))} kb/s"
 
 
-def compute_hash(path: Path, algo: str = "sha1") -> str:
-    """Calcule un hash fichier pour verification/release."""
-    h = hashlib.new(algo)
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            h.update(chunk)
+def hash_constructor(algo: str) -> Any:
+    """Retourne le nom hashlib ou le constructeur du paquet optionnel."""
+    if algo not in OPTIONAL_HASHES:
+        return algo
+    module_name, attr = OPTIONAL_HASHES[algo]
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as exc:
+        raise RuntimeError(
+            f"Hash {algo} requires the '{module_name}' package (pip install {module_name})."
+        ) from exc
+    return getattr(module, attr)
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    """Indication posix_fadvise best-effort (absente sous Windows/macOS)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def _new_hasher(digest: Any) -> Any:
+    """Instancie un hash depuis un nom hashlib ou un constructeur."""
+    return hashlib.new(digest) if isinstance(digest, str) else digest()
+
+
+class HashCancelled(RuntimeError):
+    """Hash interrompu a la demande (resultat abandonne par l'appelant)."""
+
+
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    """Interrompt le hash si l'appelant l'a abandonne."""
+    if cancel is not None and cancel.is_set():
+        raise HashCancelled("Hash cancelled.")
+
+
+def _hash_mmap(
+    fd: int, digest: Any, algo: str = "", cancel: Optional[threading.Event] = None
+) -> str:
+    """Hash d'un fichier mappe en memoire, par tranches de memoryview."""
+    if algo == "blake3":
+        h = digest(max_threads=digest.AUTO)
+    else:
+        h = _new_hasher(digest)
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            # Tranches bornees: certains backends limitent la taille d'un update().
+            for start in range(0, len(view), HASH_MMAP_SLICE):
+                _check_cancel(cancel)
+                h.update(view[start:start + HASH_MMAP_SLICE])
+    return h.hexdigest()
+
+
+def _hash_stream(
+    handle: BinaryIO, digest: Any, cancel: Optional[threading.Event] = None
+) -> str:
+    """Hash en flux depuis la position courante, via un tampon reutilise."""
+    # Buffer reutilise: pas d'allocation d'objet bytes par bloc.
+    h = _new_hasher(digest)
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    while True:
+        read = handle.readinto(buf)
+        if not read:
+            break
+        _check_cancel(cancel)
+        h.update(view[:read])
     return h.hexdigest()
 
 
+def hash_fileobj(
+    handle: BinaryIO,
+    algo: str = "sha256",
+    size: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+) -> str:
+    """Hash du fichier entier deja ouvert (binaire, non bufferise), quelle que soit sa position.
+
+    cancel: evenement qui interrompt la lecture (HashCancelled) s'il est positionne.
+    """
+    digest = hash_constructor(algo)
+    fd = handle.fileno()
+    if size is None:
+        size = os.fstat(fd).st_size
+    _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+    try:
+        # blake3 passe toujours par mmap: hash multi-thread (max_threads=AUTO) du fichier mappe.
+        if size > HASH_MMAP_THRESHOLD or (algo == "blake3" and size):
+            # Gros fichier: hash direct depuis le page cache, sans copie par bloc.
+            try:
+                return _hash_mmap(fd, digest, algo, cancel)
+            except (OSError, ValueError):
+                # mmap refuse (certains FS reseau, fichiers speciaux): lecture en flux.
+                pass
+        # Comme mmap: toujours depuis le debut du fichier.
+        handle.seek(0)
+        return _hash_stream(handle, digest, cancel)
+    finally:
+        # Lecture unique: inutile de garder la video dans le page cache.
+        _fadvise(fd, "POSIX_FADV_DONTNEED")
+
+
+# Seuils (axe, minimum, qualite) testes dans l'ordre: 0 = hauteur, 1 = largeur.
+# L'ordre compte: une largeur 4K ne l'emporte que si la hauteur est sous 1080.
+_QUALITY_STEPS = (
+    (0, 2160, "2160p"),
+    (0, 1440, "1440p"),
+    (0, 1080, "1080p"),
+    (1, 3840, "2160p"),
+    (1, 2560, "1440p"),
+    (1, 1920, "1080p"),
+    (0, 720, "720p"),
+    (1, 1280, "720p"),
+    (0, 576, "576p"),
+)
+
+
 def quality_from_resolution(height: Optional[int], width: Optional[int]) -> str:
     """Deduit une qualite (ex: 1080p) a partir des dimensions."""
     if not height and not width:
         return "N/A"
-    if height and height >= 2160:
-        return "2160p"
-    if height and height >= 1440:
-        return "1440p"
-    if height and height >= 1080:
-        return "1080p"
-    if width and width >= 3840:
-        return "2160p"
-    if width and width >= 2560:
-        return "1440p"
-    if width and width >= 1920:
-        return "1080p"
-    if height and height >= 720:
-        return "720p"
-    if width and width >= 1280:
-        return "720p"
-    if height and height >= 576:
-        return "576p"
+    dims = (height or 0, width or 0)
+    for axis, minimum, label in _QUALITY_STEPS:
+        if dims[axis] >= minimum:
+            return label
     return f"{height or width}p"
 
 
@@ -230,8 +365,34 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def read_json_cache(path: Path, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Lit une entree de cache JSON, None si absente, illisible ou expiree."""
+    try:
+        if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+            return None
+        return json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_cache(path: Path, payload: Dict[str, Any]) -> None:
+    """Ecrit une entree de cache JSON (best-effort, remplacement atomique)."""
+    # Fichier temporaire propre au thread: un lecteur concurrent ne voit jamais d'ecriture partielle.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        ensure_dir(path.parent)
+        tmp_path.write_bytes(json_dumps(payload))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=1)
 def get_cache_dir() -> Path:
-    """Retourne le dossier de cache selon l'OS."""
+    """Retourne le dossier de cache selon l'OS (calcule une fois par processus)."""
     if os.name == "nt":
         root = os.environ.get("LOCALAPPDATA") or str(Path.home() / ".cache")
     else:
@@ -239,10 +400,72 @@ def get_cache_dir() -> Path:
     return Path(root) / "nfo-gen"
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_dir() -> Path:
-    """Retourne le dossier de config selon l'OS."""
+    """Retourne le dossier de config selon l'OS (calcule une fois par processus)."""
     if os.name == "nt":
         root = os.environ.get("LOCALAPPDATA") or str(Path.home() / ".config")
     else:
         root = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
     return Path(root) / "nfo-gen"
+
+
+@functools.lru_cache(maxsize=1)
+def _json_loader() -> Callable[[Union[bytes, str]], Any]:
+    """orjson.loads si installe, sinon json.loads (import differe au premier appel)."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """json.loads via orjson si installe (leve json.JSONDecodeError dans les deux cas)."""
+    return _json_loader()(data)
+
+
+@functools.lru_cache(maxsize=1)
+def _json_dumper() -> Callable[[Any], bytes]:
+    """orjson.dumps si installe, sinon json.dumps compact encode en UTF-8."""
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    return orjson.dumps
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialise en JSON compact (bytes UTF-8): le cache n'est pas lu par un humain."""
+    return _json_dumper()(obj)
+
+
+def _config_candidates(config_path: Optional[Path]) -> Tuple[Path, ...]:
+    """Chemins de config.json a essayer, dans l'ordre."""
+    if config_path:
+        return (Path(config_path),)
+    return (
+        Path.cwd() / "config.json",
+        Path(__file__).resolve().parent / "config.json",
+        get_config_dir() / "config.json",
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config(candidates: Tuple[Path, ...]) -> Dict[str, Any]:
+    """Lit le premier config.json present (une seule lecture par jeu de chemins)."""
+    for candidate in candidates:
+        if candidate.exists():
+            try:
+                return json.loads(candidate.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                return {}
+    return {}
+
+
+def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Charge un fichier de configuration JSON si present."""
+    # Copie: le dict memoise est partage entre tous les clients.
+    return dict(_read_config(_config_candidates(config_path)))
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "NFO-MAKER"))
+
+from nfo_gen import cli
+from nfo_gen.cli import collect_videos, detect_source_from_name
+
+
+class TestDetectSource(unittest.TestCase):
+    def test_first_alnum_token_wins(self):
+        self.assertEqual(detect_source_from_name("Movie.2017.WEB-DL.REMUX.BluRay.720p.mkv"), "REMUX")
+        self.assertEqual(detect_source_from_name("Movie.2017.WEB-DL.WEBRip.mkv"), "WEBRIP")
+        self.assertEqual(detect_source_from_name("Movie.2017.1080p.BluRay.x264-GRP.mkv"), "BLURAY")
+        self.assertIsNone(detect_source_from_name("Movie.2017.WEB-DL.mkv"))
+
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for name in ("b.mkv", "a.MP4", "notes.txt", "sub/c.mkv"):
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"x")
+
+    def run_main(self, *argv):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            code = cli.main(list(argv))
+        return code, stderr.getvalue()
+
+    def test_collect_videos(self):
+        self.assertEqual([p.name for p in collect_videos(self.root)], ["a.MP4", "b.mkv"])
+        self.assertEqual([p.name for p in collect_videos(self.root, "**/*.mkv")], ["b.mkv", "c.mkv"])
+
+    def test_collect_videos_rejects_absolute_glob(self):
+        with self.assertRaises(ValueError):
+            collect_videos(self.root, str(self.root / "*.mkv"))
+
+    def test_single_movie_options_are_rejected(self):
+        for option in (["--title", "X"], ["--year", "2017"], ["--tmdb-id", "1"], ["--output", "x.nfo"]):
+            code, err = self.run_main("--no-tmdb", *option, str(self.root))
+            self.assertEqual(code, 2)
+            self.assertIn(option[0], err)
+
+    def test_invalid_glob_is_reported(self):
+        code, err = self.run_main("--no-tmdb", "--glob", str(self.root / "*.mkv"), str(self.root))
+        self.assertEqual(code, 2)
+        self.assertIn("--glob", err)
+
+    def test_existing_output_is_refused_before_hashing(self):
+        (self.root / "b.nfo").write_text("old")
+        with mock.patch.object(cli, "ensure_hash") as ensure_hash:
+            code, err = self.run_main("--no-tmdb", str(self.root / "b.mkv"))
+        self.assertEqual(code, 1)
+        self.assertIn("Output exists", err)
+        ensure_hash.assert_not_called()
+
+    def test_each_video_is_processed(self):
+        with mock.patch.object(cli, "_process_one", side_effect=[0, 1]) as process:
+            code, err = self.run_main("--no-tmdb", str(self.root))
+        self.assertEqual([call.args[1].name for call in process.call_args_list], ["a.MP4", "b.mkv"])
+        self.assertEqual(code, 1)
+        self.assertIn("1/2", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
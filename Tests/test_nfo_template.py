@@ -0,0 +1,28 @@
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "NFO-MAKER"))
+
+from nfo_gen.nfo_template import render_nfo
+
+
+class TestFileHash(unittest.TestCase):
+    def render(self, file_hash):
+        return render_nfo(None, {}, {"size_bytes": 1, "hash": file_hash})
+
+    def test_long_digest_is_rendered_in_full(self):
+        digest = "0123456789abcdef" * 4
+        text = self.render(f"SHA256 {digest}")
+        self.assertIn(digest, text)
+        self.assertIn("SHA256", text)
+
+    def test_short_digest_stays_inline(self):
+        digest = "0123456789abcdef0123456789abcdef01234567"
+        lines = [line for line in self.render(f"SHA1 {digest}").splitlines() if "Hash" in line]
+        self.assertEqual(len(lines), 1)
+        self.assertIn(f"SHA1 {digest}", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,22 @@ class TestParseFilename(unittest.TestCase):
         self.assertIn("FR", parsed.languages)
         self.assertIn("EN", parsed.languages)
 
+    def test_parsed_name_is_hashable(self):
+        name = "Movie.2020.FR.EN.mkv"
+        self.assertEqual(hash(parse_filename(name)), hash(parse_filename(name)))
+
+    def test_hyphenated_title_keeps_words(self):
+        parsed = parse_filename("Spider-Man.2002.1080p.BluRay.x264-GRP.mkv")
+        self.assertEqual(parsed.title, "Spider Man")
+        self.assertEqual(parsed.year, 2002)
+
+    def test_trailing_info_suffix_is_not_a_group(self):
+        parsed = parse_filename("Movie.2020.1080p.FR-EN.mkv")
+        self.assertEqual(parsed.languages, ("FR", "EN"))
+        self.assertEqual(parse_filename("Movie.2020.bdrip-FR.mkv").languages, ("FR",))
+        self.assertEqual(parse_filename("Movie.2020.dvdrip-multi.mkv").languages, ("MULTI",))
+        self.assertEqual(parse_filename("Movie.webrip-GRP-2160p-2019.mkv").year, 2019)
+
 
 if __name__ == "__main__":
     unittest.main()
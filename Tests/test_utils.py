@@ -0,0 +1,62 @@
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "NFO-MAKER"))
+
+from nfo_gen import utils
+
+
+class TestHashFileobj(unittest.TestCase):
+    def setUp(self):
+        self.data = os.urandom(3 * 1024 * 1024 + 17)
+        handle = tempfile.NamedTemporaryFile(delete=False)
+        handle.write(self.data)
+        handle.close()
+        self.addCleanup(os.unlink, handle.name)
+        self.path = handle.name
+
+    def hash_file(self, algo):
+        with open(self.path, "rb", buffering=0) as handle:
+            return utils.hash_fileobj(handle, algo)
+
+    def test_mmap_and_stream_paths_match(self):
+        for algo in ("sha1", "sha256"):
+            expected = hashlib.new(algo, self.data).hexdigest()
+            with mock.patch.object(utils, "HASH_MMAP_THRESHOLD", 1024):
+                self.assertEqual(self.hash_file(algo), expected)
+            with mock.patch.object(utils, "HASH_MMAP_THRESHOLD", len(self.data)):
+                self.assertEqual(self.hash_file(algo), expected)
+
+    def test_whole_file_is_hashed_whatever_the_position(self):
+        expected = hashlib.sha256(self.data).hexdigest()
+        for threshold in (1024, len(self.data)):
+            with mock.patch.object(utils, "HASH_MMAP_THRESHOLD", threshold):
+                with open(self.path, "rb", buffering=0) as handle:
+                    handle.seek(100)
+                    self.assertEqual(utils.hash_fileobj(handle, "sha256"), expected)
+
+    def test_cancelled_hash_stops_reading(self):
+        cancel = threading.Event()
+        cancel.set()
+        for threshold in (1024, len(self.data)):
+            with mock.patch.object(utils, "HASH_MMAP_THRESHOLD", threshold):
+                with open(self.path, "rb", buffering=0) as handle:
+                    with self.assertRaises(utils.HashCancelled):
+                        utils.hash_fileobj(handle, "sha256", cancel=cancel)
+
+    def test_mmap_failure_falls_back_to_stream(self):
+        expected = hashlib.sha256(self.data).hexdigest()
+        with mock.patch.object(utils, "HASH_MMAP_THRESHOLD", 1024), mock.patch.object(
+            utils.mmap, "mmap", side_effect=OSError("mmap unsupported")
+        ):
+            self.assertEqual(self.hash_file("sha256"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()